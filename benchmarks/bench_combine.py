@@ -0,0 +1,121 @@
+"""
+Micro-benchmark of the combine step on synthetic scraper output.
+
+    python benchmarks/bench_combine.py --rows 100000
+
+Compares the old per-row path (iterrows + clean_link/clean_description)
+with the vectorized normalize_frame + combine_frames path.
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapers.normalize import (  # noqa: E402
+    FINAL_COLUMNS, clean_description, clean_link, combine_frames, normalize_frame
+)
+
+# (source, vertical column) as the scrapers return them
+SOURCES = [
+    ("ESTM", "Matched_Vertical"),
+    ("C40", "Matched_Vertical"),
+    ("onepurpos", "Matched_Vertical"),
+    ("DevelopmentAid", "Category"),
+]
+
+DESCRIPTIONS = [None, "", "nan", "  Climate resilience programme for coastal cities.  ", "Water and sanitation tender " * 20]
+
+
+# ======================================================
+# SYNTHETIC DATA
+# ======================================================
+def synthetic_frames(rows, seed=0):
+    rng = random.Random(seed)
+    per_source = rows // len(SOURCES)
+    frames = []
+
+    for source, vertical_column in SOURCES:
+        records = []
+        for i in range(per_source):
+            link = f"https://example.org/{source.lower()}/{i}"
+            if source == "ESTM":
+                link = f'=HYPERLINK("{link}", "Apply")'
+            records.append({
+                "Title": f"{source} posting {i}",
+                "Description": rng.choice(DESCRIPTIONS),
+                vertical_column: rng.choice(["Urban", "Climate", "", None]),
+                "Deadline": f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                "Apply_Link": link,
+            })
+        frames.append((source, vertical_column, pd.DataFrame(records)))
+
+    return frames
+
+
+# ======================================================
+# COMBINE IMPLEMENTATIONS
+# ======================================================
+def combine_rowwise(frames):
+    rows = []
+    for source, vertical_column, df in frames:
+        for _, row in df.iterrows():
+            rows.append({
+                "Source": source,
+                "Title": row.get("Title"),
+                "Description": clean_description(row.get("Description")),
+                "Matched_Vertical": row.get(vertical_column),
+                "Deadline": row.get("Deadline"),
+                "Apply_Link": clean_link(row.get("Apply_Link"))
+            })
+    return pd.DataFrame(rows, columns=FINAL_COLUMNS)
+
+
+def combine_vectorized(frames):
+    return combine_frames([
+        normalize_frame(df, source, {vertical_column: "Matched_Vertical"})
+        for source, vertical_column, df in frames
+    ])
+
+
+def timed(func, frames, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(frames)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+# ======================================================
+# MAIN
+# ======================================================
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the combine step")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--skip-rowwise", action="store_true", help="only time the vectorized path")
+    args = parser.parse_args()
+
+    frames = synthetic_frames(args.rows)
+    print(f"📊 {sum(len(df) for _, _, df in frames)} synthetic rows from {len(frames)} sources")
+
+    vec_time, vec_df = timed(combine_vectorized, frames, args.repeat)
+    print(f"⚡ vectorized: {vec_time:.3f}s ({len(vec_df) / vec_time:,.0f} rows/s)")
+
+    if not args.skip_rowwise:
+        row_time, row_df = timed(combine_rowwise, frames, 1)
+        print(f"🐢 row-wise:   {row_time:.3f}s ({len(row_df) / row_time:,.0f} rows/s)")
+        print(f"🚀 speed-up:   {row_time / vec_time:.1f}x")
+
+        same = row_df.fillna("").astype(str).equals(vec_df.fillna("").astype(str))
+        print("✅ outputs identical" if same else "❌ outputs differ")
+
+
+if __name__ == "__main__":
+    main()
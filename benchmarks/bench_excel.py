@@ -0,0 +1,80 @@
+"""
+Time and peak memory of the Combined.xlsx writers.
+
+    python benchmarks/bench_excel.py --rows 10000 100000
+
+Each (writer, size) pair runs in a fresh interpreter so peak RSS is not
+shared between runs.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+# ======================================================
+# SINGLE RUN (CHILD PROCESS)
+# ======================================================
+def run_once(mode, rows):
+    from benchmarks.bench_combine import combine_vectorized, synthetic_frames
+    from scrapers.export import write_excel
+
+    df = combine_vectorized(synthetic_frames(rows))
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "Combined.xlsx")
+        start = time.perf_counter()
+        write_excel(df, path, mode=mode)
+        elapsed = time.perf_counter() - start
+        size = os.path.getsize(path)
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "mode": mode,
+        "rows": len(df),
+        "seconds": round(elapsed, 2),
+        "peak_mb": round(peak / 1024, 1),
+        "writer_mb": round((peak - baseline) / 1024, 1),
+        "file_mb": round(size / 1024 / 1024, 1),
+    }
+
+
+# ======================================================
+# MAIN
+# ======================================================
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Excel writers")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--modes", nargs="+", default=["stream", "pandas"])
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "ROWS"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        mode, rows = args.child
+        print(json.dumps(run_once(mode, int(rows))))
+        return
+
+    for rows in args.rows:
+        for mode in args.modes:
+            out = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--child", mode, str(rows)],
+                cwd=ROOT, capture_output=True, text=True, check=True
+            )
+            r = json.loads(out.stdout.strip().splitlines()[-1])
+            print(
+                f"📊 {r['mode']:>6} {r['rows']:>7} rows: {r['seconds']:>6.2f}s, "
+                f"+{r['writer_mb']} MB while writing (peak RSS {r['peak_mb']} MB), "
+                f"file {r['file_mb']} MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
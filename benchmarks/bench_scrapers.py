@@ -0,0 +1,148 @@
+"""
+Throughput, peak memory and per-stage time of each scraper against the
+offline fixture sites (benchmarks/sites.py).
+
+    python benchmarks/bench_scrapers.py --postings 100 1000 10000 --latency 0.05
+
+Each (source, size) pair runs in a fresh interpreter pointed at a local
+fixture server, with the page cache and the postings store disabled so
+every run does the full work.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.sites import SCALES, site_env, start_site  # noqa: E402
+
+SOURCES = ["C40", "ESTM", "onepurpos", "DevelopmentAid"]
+
+# A scraper that needs longer than this on one size is reported as failed
+CHILD_TIMEOUT = 30 * 60
+
+
+# ======================================================
+# SINGLE RUN (CHILD PROCESS)
+# ======================================================
+def run_once(source):
+    from scrapers import timing
+    from scrapers.registry import discover, registered
+    from scrapers.stream import batched
+
+    discover()
+    scraper = registered([source])[0]
+
+    timing.reset()
+    timing.set_source(scraper.name)
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    rows = 0
+    start = time.perf_counter()
+    for batch in batched(scraper.records()):
+        rows += len(batch)
+    elapsed = time.perf_counter() - start
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "source": scraper.name,
+        "rows": rows,
+        "seconds": round(elapsed, 2),
+        "rows_per_s": round(rows / elapsed, 1) if elapsed else 0.0,
+        "peak_mb": round(peak / 1024, 1),
+        "scrape_mb": round((peak - baseline) / 1024, 1),
+        "stages": timing.summarize(timing.span_stats()).get(scraper.name, {}),
+    }
+
+
+def run_child(source, postings, base, store, estm_mode):
+    env = {
+        **os.environ,
+        **site_env(base),
+        "PAGE_CACHE": "0",
+        "POSTINGS_DB": store,
+        "SCRAPER_INCREMENTAL": "0",
+        "ESTM_MODE": estm_mode,
+    }
+
+    try:
+        out = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", source],
+            cwd=ROOT, env=env, capture_output=True, text=True, timeout=CHILD_TIMEOUT
+        )
+    except subprocess.TimeoutExpired:
+        return {"source": source, "postings": postings, "error": f"timed out after {CHILD_TIMEOUT}s"}
+
+    if out.returncode != 0:
+        lines = (out.stderr or out.stdout).strip().splitlines()
+        return {"source": source, "postings": postings, "error": lines[-1] if lines else f"exit {out.returncode}"}
+
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    result["postings"] = postings
+    return result
+
+
+# ======================================================
+# REPORTING
+# ======================================================
+def format_result(r, top=3):
+    if "error" in r:
+        return f"❌ {r['source']:>14} {r['postings']:>6} postings: {r['error']}"
+
+    slowest = sorted(r["stages"].items(), key=lambda kv: kv[1]["total"], reverse=True)[:top]
+    line = (
+        f"📊 {r['source']:>14} {r['postings']:>6} postings: {r['rows']:>6} rows in {r['seconds']:>7.2f}s "
+        f"({r['rows_per_s']} rows/s), +{r['scrape_mb']} MB (peak RSS {r['peak_mb']} MB)"
+    )
+    if slowest:
+        line += " | " + ", ".join(f"{stage} {v['total']:.1f}s/{v['count']}" for stage, v in slowest)
+    return line
+
+
+# ======================================================
+# MAIN
+# ======================================================
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scrapers against offline fixture sites")
+    parser.add_argument("--postings", type=int, nargs="+", default=list(SCALES))
+    parser.add_argument("--sources", nargs="+", default=SOURCES)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="± random seconds on top of --latency")
+    parser.add_argument("--estm-mode", default="api", choices=["api", "browser"])
+    parser.add_argument("--out", help="also write the results as JSON to this path")
+    parser.add_argument("--child", metavar="SOURCE", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_once(args.child)))
+        return
+
+    results = []
+    for postings in args.postings:
+        server, base = start_site(postings, latency=args.latency, jitter=args.jitter)
+        print(f"🧪 {postings} postings per source on {base} (latency {args.latency}s ± {args.jitter}s)")
+
+        try:
+            for source in args.sources:
+                with tempfile.TemporaryDirectory() as tmp:
+                    r = run_child(source, postings, base, os.path.join(tmp, "postings.db"), args.estm_mode)
+                results.append(r)
+                print(format_result(r))
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"latency": args.latency, "jitter": args.jitter, "results": results}, f, indent=2)
+        print("🧾 Results written:", args.out)
+
+
+if __name__ == "__main__":
+    main()
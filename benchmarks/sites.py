@@ -0,0 +1,323 @@
+"""
+Fixture versions of the four job sites, served from one local HTTP server.
+
+    python benchmarks/sites.py --postings 1000 --latency 0.05
+
+Every source gets ``postings`` listings with detail pages, in the markup
+its scraper expects. Point the scrapers at it with the environment
+variables printed on start (see ``site_env``).
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from datetime import date, timedelta
+from html import escape
+from http.server import ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapers.classifier import KEYWORDS_FILE  # noqa: E402
+from scrapers.estm.estm_api import DETAILS_PATH, JOB_PATH, REQUISITIONS_PATH, SITE_NUMBER  # noqa: E402
+from scrapers.estm.stub_server import make_handler as make_estm_api_handler  # noqa: E402
+
+# ======================================================
+# CONFIG
+# ======================================================
+SCALES = (100, 1_000, 10_000)
+
+# Share of postings whose title carries a vertical keyword
+MATCH_RATE = 0.8
+
+# Share of postings whose deadline has already passed
+EXPIRED_RATE = 0.0
+
+# JSON the OnePurpos listing pages load their cards from
+ONEPURPOS_API_PATH = "/onepurpos/api/openings"
+
+# DevelopmentAid search API, and the results per page it and the search page show
+DA_API_PATH = "/da/api/tenders/search"
+DA_PAGE_SIZE = 20
+
+FILLER = (
+    "The programme works with city governments and community partners. "
+    "Applicants should describe their approach, team and budget. "
+)
+
+ROLES = ("Consultant", "Programme Officer", "Technical Expert", "Research Fellow", "Project Lead")
+NEUTRAL = ("Finance", "Procurement", "Logistics", "Administration", "Operations")
+
+
+# ======================================================
+# POSTINGS
+# ======================================================
+def _keywords():
+    """Keywords in every source's set, so a topic matches whichever source serves it."""
+    with open(KEYWORDS_FILE, encoding="utf-8") as f:
+        sets = [{k for terms in verticals.values() for k in terms} for verticals in json.load(f).values()]
+    return sorted(set.intersection(*sets))
+
+
+def generate_postings(n, seed=0, match_rate=MATCH_RATE, expired_rate=EXPIRED_RATE):
+    """``n`` postings with titles, descriptions and deadlines (future unless expired)."""
+    rng = random.Random(seed)
+    keywords = _keywords()
+    today = date.today()
+
+    postings = []
+    for i in range(n):
+        topic = rng.choice(keywords) if rng.random() < match_rate else rng.choice(NEUTRAL)
+        title = f"{rng.choice(ROLES)} - {topic.title()} #{i}"
+        if rng.random() < expired_rate:
+            deadline = today - timedelta(days=rng.randint(1, 90))
+        else:
+            deadline = today + timedelta(days=rng.randint(7, 180))
+        postings.append({
+            "id": str(100000 + i),
+            "title": title,
+            "deadline": deadline.isoformat(),
+            "location": rng.choice(("Mumbai", "New Delhi", "Pune", "Chennai")),
+            "description": f"{title}. " + FILLER * rng.randint(2, 8),
+        })
+    return postings
+
+
+# ======================================================
+# PAGES
+# ======================================================
+def _page(body):
+    return f"<!DOCTYPE html><html><head><meta charset='utf-8'></head><body>{body}</body></html>"
+
+
+def c40_listing(postings):
+    cards = "".join(
+        f'<a class="link-cards-item" href="/c40/rfp/{p["id"]}">'
+        f'<h3>{escape(p["title"])}</h3><h4>Deadline: {p["deadline"]}</h4></a>'
+        for p in postings
+    )
+    return _page(f"<main>{cards}</main>")
+
+
+def estm_listing(postings):
+    cards = "".join(
+        f'<div class="job-grid-item">'
+        f'<a href="/estm/job/{p["id"]}"></a>'
+        f'<div class="job-grid-item__link"><div class="job-grid-item__content">'
+        f'<span class="job-tile__title">{escape(p["title"])}</span>'
+        f'<span data-bind="text: primaryLocation">{p["location"]}</span>'
+        f'</div></div></div>'
+        for p in postings
+    )
+    return _page(cards)
+
+
+def estm_detail(p):
+    return _page(
+        f'<div class="job-details__info-section">'
+        f'<span>Apply Before</span><span>{p["deadline"]}</span></div>'
+    )
+
+
+def da_listing(postings):
+    # like the real search page, only the first page of results is rendered
+    postings = postings[:DA_PAGE_SIZE]
+    cards = "".join(
+        f'<da-tender-content-card>'
+        f'<a class="search-card__title" title="{escape(p["title"])}" href="/da/tender/{p["id"]}">'
+        f'{escape(p["title"])}</a>'
+        f'<div class="tender-deadline"><span>Deadline:</span><span>{p["deadline"]}</span></div>'
+        f'</da-tender-content-card>'
+        for p in postings
+    )
+    script = f'<script>fetch("{DA_API_PATH}?locations=147&page=1&size={DA_PAGE_SIZE}")</script>'
+    return _page(cards + script)
+
+
+def da_api(postings, query):
+    """One page of DevelopmentAid search results (``page`` / ``size`` parameters)."""
+    size = max(1, int(query.get("size", [str(DA_PAGE_SIZE)])[0]))
+    page = max(1, int(query.get("page", ["1"])[0]))
+    items = [
+        {"id": int(p["id"]), "title": p["title"], "url": f"/da/tender/{p['id']}", "deadline": p["deadline"]}
+        for p in postings[(page - 1) * size:page * size]
+    ]
+    return {"items": items, "page": page, "size": size, "total": len(postings)}
+
+
+def onepurpos_listing(postings, kind):
+    cards = "".join(
+        f'<a class="card-link" href="/onepurpos/openings/{kind}/{p["id"]}">'
+        f'<p class="large-card-title">{escape(p["title"])}</p>'
+        f'<p class="large-card-date-text">{p["deadline"]}</p></a>'
+        for p in postings
+    )
+    # the request a browser sees the real page make for its cards
+    script = f'<script>fetch("{ONEPURPOS_API_PATH}?type={kind}&page=1&limit=20")</script>'
+    return _page(cards + script)
+
+
+def onepurpos_api(postings, query):
+    """One page of the OnePurpos openings JSON (``page`` / ``limit`` parameters)."""
+    limit = max(1, int(query.get("limit", ["20"])[0]))
+    page = max(1, int(query.get("page", ["1"])[0]))
+    items = [
+        {"id": int(p["id"]), "slug": p["id"], "title": p["title"], "deadline": p["deadline"]}
+        for p in postings[(page - 1) * limit:page * limit]
+    ]
+    return {"data": items, "page": page, "limit": limit, "total": len(postings)}
+
+
+def detail_page(p, wrapper):
+    return _page(wrapper.format(text=escape(p["description"])))
+
+
+DETAIL_WRAPPERS = {
+    "c40": "<main><p>{text}</p></main>",
+    "da": '<div class="view-excerpt"><p>{text}</p></div>',
+    "onepurpos": '<div class="details-card-body"><div class="editor-content-main"><p>{text}</p></div></div>',
+}
+
+
+def estm_api_fixtures(postings):
+    """Requisition search and detail JSON in the shape the stub server serves."""
+    listing = [{
+        "Id": p["id"],
+        "Title": p["title"],
+        "PrimaryLocation": p["location"],
+        "ShortDescriptionStr": f"<p>{escape(p['title'])}</p>",
+    } for p in postings]
+
+    details = {p["id"]: {
+        "Id": p["id"],
+        "Title": p["title"],
+        "PrimaryLocation": p["location"],
+        "ExternalPostedEndDate": f"{p['deadline']}T23:59:00+00:00",
+        "ExternalDescriptionStr": f"<p>{escape(p['description'])}</p>",
+    } for p in postings}
+
+    return {"items": [{"TotalJobsCount": len(listing), "requisitionList": listing}]}, details
+
+
+# ======================================================
+# SITE
+# ======================================================
+class FixtureSite:
+    """Pages of every source for one set of postings, rendered once."""
+
+    def __init__(self, postings):
+        self.postings = {p["id"]: p for p in postings}
+        self.listed = postings
+        half = len(postings) // 2
+        self.openings = {"grants": postings[:half], "rfps": postings[half:]}
+
+        self.pages = {
+            "/c40/work-with-c40/": c40_listing(postings),
+            "/estm/jobs": estm_listing(postings),
+            "/da/tenders/search": da_listing(postings),
+            "/onepurpos/openings/grants": onepurpos_listing(self.openings["grants"], "grants"),
+            "/onepurpos/openings/rfps": onepurpos_listing(self.openings["rfps"], "rfps"),
+        }
+        self.api = estm_api_fixtures(postings)
+
+    def page(self, path):
+        if path in self.pages:
+            return self.pages[path]
+
+        parts = path.strip("/").split("/")
+        if len(parts) < 3 or parts[-1] not in self.postings:
+            return None
+        p = self.postings[parts[-1]]
+
+        if parts[0] == "estm" or path.startswith(JOB_PATH.format(site=SITE_NUMBER, id="")):
+            return estm_detail(p)
+        if parts[0] in DETAIL_WRAPPERS:
+            return detail_page(p, DETAIL_WRAPPERS[parts[0]])
+        return None
+
+
+def make_handler(site, latency=0.0, jitter=0.0):
+    api_handler = make_estm_api_handler(*site.api)
+
+    class SiteHandler(api_handler):
+        def do_GET(self):
+            if latency or jitter:
+                time.sleep(max(0.0, latency + random.uniform(-jitter, jitter)))
+
+            url = urlparse(self.path)
+            path = url.path
+            if path in (REQUISITIONS_PATH, DETAILS_PATH):
+                return super().do_GET()
+
+            query = parse_qs(url.query)
+            if path == ONEPURPOS_API_PATH:
+                postings = site.openings.get(query.get("type", [""])[0], [])
+                payload = onepurpos_api(postings, query)
+            elif path == DA_API_PATH:
+                payload = da_api(site.listed, query)
+            else:
+                payload = None
+
+            if payload is not None:
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+
+            html = site.page(path)
+            body = (html or "<h1>Not found</h1>").encode("utf-8")
+            self.send_response(200 if html else 404)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return SiteHandler
+
+
+def start_site(postings, port=0, latency=0.0, jitter=0.0, seed=0, expired_rate=EXPIRED_RATE):
+    """Serve a generated site in a background thread; returns (server, base URL)."""
+    site = FixtureSite(generate_postings(postings, seed, expired_rate=expired_rate))
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(site, latency, jitter))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def site_env(base):
+    """Environment that points every scraper at the fixture site at ``base``."""
+    return {
+        "C40_URL": f"{base}/c40/work-with-c40/",
+        "ESTM_URL": f"{base}/estm/jobs",
+        "ESTM_API_HOST": base,
+        "DA_BASE_URL": f"{base}/da",
+        "DA_API_URL": f"{base}{DA_API_PATH}?locations=147&page=1&size={DA_PAGE_SIZE}",
+        "ONEPURPOS_BASE_URL": f"{base}/onepurpos",
+        "ONEPURPOS_API_URL": f"{base}{ONEPURPOS_API_PATH}?type={{kind}}&page=1&limit=20",
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve fixture versions of the job sites")
+    parser.add_argument("--postings", type=int, default=SCALES[0])
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="± random seconds on top of --latency")
+    parser.add_argument("--expired", type=float, default=EXPIRED_RATE, help="share of postings already expired")
+    args = parser.parse_args()
+
+    server, base = start_site(args.postings, args.port, args.latency, args.jitter, expired_rate=args.expired)
+    print(f"🧪 Fixture sites with {args.postings} postings each on {base}")
+    for key, value in site_env(base).items():
+        print(f"   export {key}={value}")
+
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -1,14 +1,21 @@
 import os
+import argparse
+import signal
+import time
 import traceback
-import pandas as pd
-import re
-from openpyxl import load_workbook
-from openpyxl.styles import Alignment
+import multiprocessing as mp
+from multiprocessing.connection import wait
 
-from scrapers.estm.estm import scrape_jobs as scrape_estm_jobs
-from scrapers.c40.c40 import scrape_c40_jobs
-from scrapers.developmentaid.developmentaid import scrape_jobs as scrape_developmentaid_jobs
-from scrapers.onepurpose import scrape_onepurpose_jobs  # ✅ NEW
+from scrapers.deadlines import DROP_EXPIRED, add_deadline_columns, drop_expired, sort_by_deadline
+from scrapers.dedup import dedupe, format_stats as format_dedup_stats
+from scrapers.export import write_dataset
+from scrapers.registry import discover, registered
+from scrapers.stream import JsonlSink, RecordStream, batched
+from scrapers.pushdown import avoided, pushdown_stats, format_stats as format_pushdown_stats
+from scrapers.browser import network_stats, format_stats as format_network_stats
+from scrapers.cache import cache_stats, format_stats as format_cache_stats
+from scrapers.readiness import wait_stats, format_stats as format_wait_stats
+from scrapers import replay, timing
 
 
 # ======================================================
@@ -19,212 +26,330 @@ BASE_DIR = os.getcwd()
 OUTPUT_DIR = os.path.join(BASE_DIR, "output")
 COMBINED_FILE = os.path.join(OUTPUT_DIR, "Combined.xlsx")
 
-FINAL_COLUMNS = [
-    "Source",
-    "Title",
-    "Description",
-    "Matched_Vertical",
-    "Deadline",
-    "Apply_Link"
-]
+# Rows land here as they are scraped; the other outputs are built from it
+STREAM_FILE = os.path.join(OUTPUT_DIR, "stream.jsonl")
+
+# Per-source / per-stage timings of the last run
+REPORT_FILE = os.path.join(OUTPUT_DIR, "run_report.json")
 
 
 # ======================================================
-# EXCEL FORMAT FUNCTION
+# SCRAPER DISCOVERY
 # ======================================================
 
-def format_excel(path):
-    try:
-        wb = load_workbook(path)
-        ws = wb.active
+# Every package under scrapers/ registers its plugin on import
+discover()
 
-        ws.column_dimensions["A"].width = 20
-        ws.column_dimensions["B"].width = 55
-        ws.column_dimensions["C"].width = 120
-        ws.column_dimensions["D"].width = 35
-        ws.column_dimensions["E"].width = 25
-        ws.column_dimensions["F"].width = 60
+# Seconds a cancelled worker gets to exit after SIGTERM before SIGKILL
+KILL_GRACE = 10
 
-        for row in ws.iter_rows(min_row=2):
-            ws.row_dimensions[row[0].row].height = 95
-            for cell in row:
-                cell.alignment = Alignment(wrap_text=True, vertical="top")
 
-        wb.save(path)
-        print("✅ Excel formatting applied")
+# ======================================================
+# OUTPUT COLLECTION
+# ======================================================
 
-    except Exception:
-        print("❌ Excel formatting failed")
-        traceback.print_exc()
+def report_source(stream, scraper):
+    rows = stream.rows(scraper.name)
+    if rows:
+        print(f"✅ {scraper.name} rows added: {rows}")
+    else:
+        print(f"⚠ {scraper.name} returned no data")
 
 
 # ======================================================
-# CLEAN LINK FUNCTION
+# RUN STATISTICS
 # ======================================================
 
-def clean_link(link):
-    if not isinstance(link, str) or not link.strip():
-        return ""
+def collect_stats():
+    return {
+        "cache": cache_stats(),
+        "waits": wait_stats(),
+        "network": network_stats(),
+        "spans": timing.span_stats(),
+        "pushdown": pushdown_stats(),
+        "archive": replay.replay_stats()
+    }
+
+
+def merge_stats(run_stats, stats):
+    # nested dicts of counters: add numbers, concatenate samples, recurse into dicts
+    for key, value in (stats or {}).items():
+        if isinstance(value, dict):
+            merge_stats(run_stats.setdefault(key, {}), value)
+        elif isinstance(value, list):
+            run_stats.setdefault(key, []).extend(value)
+        else:
+            run_stats[key] = run_stats.get(key, 0) + value
+
+
+def record_outcome(run_stats, scraper, status, started, error=None):
+    seconds = time.monotonic() - started
+    timing.record_span("scrape", seconds, source=scraper.name, error=status != "ok")
+    run_stats.setdefault("outcomes", {})[scraper.name] = {
+        "status": status,
+        "seconds": round(seconds, 3),
+        "error": error.strip().splitlines()[-1] if error else None
+    }
+
+
+def build_report(scrapers, stream, run_stats, started):
+    spans = timing.summarize(run_stats.get("spans", {}))
+    outcomes = run_stats.get("outcomes", {})
+    pushdown = run_stats.get("pushdown", {})
+
+    sources = {}
+    for scraper in scrapers:
+        counts = stream.counts[scraper.name]
+        sources[scraper.name] = {
+            **outcomes.get(scraper.name, {"status": "not run"}),
+            "rows": counts["rows"],
+            "duplicates": counts["duplicates"],
+            "expired": counts["expired"],
+            "fetches_avoided": avoided(pushdown.get(scraper.name, {})),
+            "stages": spans.get(scraper.name, {})
+        }
+
+    return {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "seconds": round(time.monotonic() - started, 3),
+        "rows": sum(s["rows"] for s in sources.values()),
+        "dedup": run_stats.get("dedup", {}),
+        "sources": sources,
+        "runner": {"stages": spans.get(timing.RUNNER, {})}
+    }
 
-    link = link.strip()
 
-    if 'HYPERLINK(' in link:
-        match = re.search(r'HYPERLINK\("([^"]+)"', link)
-        if match:
-            return match.group(1)
+# ======================================================
+# SEQUENTIAL EXECUTION
+# ======================================================
+
+def run_scrapers_sequential(scrapers, stream, run_stats):
+    for scraper in scrapers:
+        started = time.monotonic()
+        timing.set_source(scraper.name)
+        try:
+            print(f"🔎 Running {scraper.name} scraper...")
+            for batch in batched(scraper.records()):
+                stream.add(scraper, batch)
+            record_outcome(run_stats, scraper, "ok", started)
 
-    return link
+        except Exception:
+            print(f"❌ {scraper.name} failed")
+            traceback.print_exc()
+            record_outcome(run_stats, scraper, "error", started, traceback.format_exc())
 
+        finally:
+            timing.set_source(timing.RUNNER)
 
-# ======================================================
-# CLEAN DESCRIPTION FUNCTION
-# ======================================================
+        report_source(stream, scraper)
 
-def clean_description(desc):
-    if not desc or str(desc).strip().lower() in ["", "nan", "none"]:
-        return "No description available"
-    return str(desc).strip()
+    merge_stats(run_stats, collect_stats())
+    # spans recorded so far now live in run_stats
+    timing.reset()
 
 
 # ======================================================
-# MAIN RUNNER FUNCTION
+# PARALLEL EXECUTION
 # ======================================================
 
-def run_all_scrapers_and_combine():
+# Worker → runner messages: ("rows", batch, None, None) while scraping, then
+# ("ok", None, None, stats) or ("error", None, traceback, stats)
+
+def _scraper_worker(scraper, conn):
+    # Own process group, so cancelling also takes down chromedriver/Chrome
+    if hasattr(os, "setpgrp"):
+        os.setpgrp()
+
+    # spans of this process belong to the scraper, not to the forked runner
+    timing.reset()
+    timing.set_source(scraper.name)
+
     try:
-        print("🚀 Starting scraper process...")
-        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        for batch in batched(scraper.records()):
+            conn.send(("rows", batch, None, None))
+        conn.send(("ok", None, None, collect_stats()))
+    except Exception:
+        conn.send(("error", None, traceback.format_exc(), collect_stats()))
+    finally:
+        conn.close()
 
-        combined_rows = []
 
-        # ======================================================
-        # ESTM SCRAPER
-        # ======================================================
+def _kill_worker(proc):
+    if not proc.is_alive():
+        return
 
+    try:
+        os.killpg(proc.pid, signal.SIGTERM)
+    except (AttributeError, ProcessLookupError):
+        proc.terminate()
+
+    proc.join(KILL_GRACE)
+
+    if proc.is_alive():
         try:
-            print("🔎 Running ESTM scraper...")
-            estm_df = scrape_estm_jobs()
-
-            if estm_df is not None and not estm_df.empty:
-                for _, row in estm_df.iterrows():
-                    combined_rows.append({
-                        "Source": "ESTM",
-                        "Title": row.get("Title"),
-                        "Description": clean_description(row.get("Description")),
-                        "Matched_Vertical": row.get("Matched_Vertical"),
-                        "Deadline": row.get("Deadline"),
-                        "Apply_Link": clean_link(row.get("Apply_Link"))
-                    })
-
-                print(f"✅ ESTM rows added: {len(estm_df)}")
-            else:
-                print("⚠ ESTM returned no data")
+            os.killpg(proc.pid, signal.SIGKILL)
+        except (AttributeError, ProcessLookupError):
+            proc.kill()
+        proc.join()
 
-        except Exception:
-            print("❌ ESTM failed")
-            traceback.print_exc()
 
+def run_scrapers_parallel(scrapers, stream, run_stats):
+    workers = {}
 
-        # ======================================================
-        # C40 SCRAPER
-        # ======================================================
+    try:
+        for scraper in scrapers:
+            reader, writer = mp.Pipe(duplex=False)
+            proc = mp.Process(
+                target=_scraper_worker,
+                args=(scraper, writer),
+                name=f"scraper-{scraper.name}",
+                daemon=True
+            )
+            proc.start()
+            writer.close()
+
+            budget = scraper.time_budget
+            started = time.monotonic()
+            workers[reader] = (scraper, proc, started + budget, started)
+            print(f"🔎 Started {scraper.name} scraper (budget {budget}s, pid {proc.pid})")
+
+        while workers:
+            next_deadline = min(w[2] for w in workers.values())
+            timeout = max(0.0, next_deadline - time.monotonic())
+
+            for reader in wait(list(workers), timeout=timeout):
+                scraper, proc, _, started = workers[reader]
+
+                try:
+                    status, rows, error, stats = reader.recv()
+                except EOFError:
+                    status, rows, error, stats = "error", None, f"worker exited with code {proc.exitcode}", {}
+
+                # 🔥 rows are classified, deduplicated and written as they arrive
+                if status == "rows":
+                    stream.add(scraper, rows)
+                    continue
+
+                del workers[reader]
+                reader.close()
+                proc.join(KILL_GRACE)
+                _kill_worker(proc)
+
+                merge_stats(run_stats, stats)
+                record_outcome(run_stats, scraper, status, started, error)
+
+                if status == "error":
+                    print(f"❌ {scraper.name} failed")
+                    print(error)
+                report_source(stream, scraper)
+
+            now = time.monotonic()
+            for reader, (scraper, proc, deadline, started) in list(workers.items()):
+                if now >= deadline:
+                    record_outcome(run_stats, scraper, "timeout", started, "exceeded its time budget")
+                    print(
+                        f"⏱ {scraper.name} exceeded its time budget, cancelling "
+                        f"({stream.rows(scraper.name)} rows already kept)"
+                    )
+                    del workers[reader]
+                    reader.close()
+                    _kill_worker(proc)
+
+    finally:
+        for reader, (_, proc, _, _) in workers.items():
+            reader.close()
+            _kill_worker(proc)
 
-        try:
-            print("🔎 Running C40 scraper...")
-            c40_df = scrape_c40_jobs()
-
-            if c40_df is not None and not c40_df.empty:
-                for _, row in c40_df.iterrows():
-                    combined_rows.append({
-                        "Source": "C40",
-                        "Title": row.get("Title"),
-                        "Description": clean_description(row.get("Description")),
-                        "Matched_Vertical": row.get("Matched_Vertical"),
-                        "Deadline": row.get("Deadline"),
-                        "Apply_Link": clean_link(row.get("Apply_Link"))
-                    })
-
-                print(f"✅ C40 rows added: {len(c40_df)}")
-            else:
-                print("⚠ C40 returned no data")
 
-        except Exception:
-            print("❌ C40 failed")
-            traceback.print_exc()
+# ======================================================
+# MAIN RUNNER FUNCTION
+# ======================================================
 
+def write_run_report(scrapers, stream, run_stats, started):
+    try:
+        merge_stats(run_stats, {"spans": timing.span_stats()})
+        report = build_report(scrapers, stream, run_stats, started)
+        timing.write_report(REPORT_FILE, report)
 
-        # ======================================================
-        # ONEPURPOSE SCRAPER ✅ NEW
-        # ======================================================
+        stages = {name: src["stages"] for name, src in report["sources"].items()}
+        stages[timing.RUNNER] = report["runner"]["stages"]
+        for line in timing.format_stats(stages):
+            print(line)
+        print("🧾 Run report written:", REPORT_FILE)
 
-        try:
-            print("🔎 Running OnePurpos scraper...")
-            op_df = scrape_onepurpose_jobs()
-
-            if op_df is not None and not op_df.empty:
-                for _, row in op_df.iterrows():
-                    combined_rows.append({
-                        "Source": "onepurpos",
-                        "Title": row.get("Title"),
-                        "Description": clean_description(row.get("Description")),
-                        "Matched_Vertical": row.get("Matched_Vertical"),
-                        "Deadline": row.get("Deadline"),
-                        "Apply_Link": clean_link(row.get("Apply_Link"))
-                    })
-
-                print(f"✅ OnePurpos rows added: {len(op_df)}")
-            else:
-                print("⚠ OnePurpos returned no data")
+    except Exception:
+        print("❌ Run report failed")
+        traceback.print_exc()
 
-        except Exception:
-            print("❌ OnePurpos failed")
-            traceback.print_exc()
 
+def run_all_scrapers_and_combine(parallel=True, sources=None):
+    started = time.monotonic()
+    scrapers, stream, run_stats = [], None, {}
 
-        # ======================================================
-        # DevelopmentAid SCRAPER
-        # ======================================================
+    try:
+        print("🚀 Starting scraper process...")
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        timing.reset()
 
-        try:
-            print("🔎 Running DevelopmentAid scraper...")
-            da_df = scrape_developmentaid_jobs()
-
-            if da_df is not None and not da_df.empty:
-                for _, row in da_df.iterrows():
-                    combined_rows.append({
-                        "Source": "DevelopmentAid",
-                        "Title": row.get("Title"),
-                        "Description": clean_description(row.get("Description")),
-                        "Matched_Vertical": row.get("Category"),
-                        "Deadline": row.get("Deadline"),
-                        "Apply_Link": clean_link(row.get("Apply_Link"))
-                    })
-
-                print(f"✅ DevelopmentAid rows added: {len(da_df)}")
+        scrapers = registered(sources)
+        if not scrapers:
+            print(f"❌ No registered scraper matches {sources}")
+            return None
+
+        with JsonlSink(STREAM_FILE) as sink:
+            stream = RecordStream(sink)
+
+            if parallel:
+                run_scrapers_parallel(scrapers, stream, run_stats)
             else:
-                print("⚠ DevelopmentAid returned no data")
+                run_scrapers_sequential(scrapers, stream, run_stats)
 
-        except Exception:
-            print("❌ DevelopmentAid failed")
-            traceback.print_exc()
+        for line in format_cache_stats(run_stats.get("cache", {})):
+            print(line)
+        for line in format_wait_stats(run_stats.get("waits", {})):
+            print(line)
+        for line in format_pushdown_stats(run_stats.get("pushdown", {})):
+            print(line)
+        for line in format_network_stats(run_stats.get("network", {})):
+            print(line)
+        for line in replay.format_stats(run_stats.get("archive", {})):
+            print(line)
 
 
         # ======================================================
         # FINAL EXPORT
         # ======================================================
 
-        if not combined_rows:
+        # Grouped by source in registry order, not arrival order
+        with timing.span("combine"):
+            combined_df = stream.frame(order=[scraper.name for scraper in scrapers])
+            combined_df = add_deadline_columns(combined_df)
+
+        if combined_df.empty:
             print("❌ No data collected from any scraper")
             return None
 
-        combined_df = pd.DataFrame(combined_rows, columns=FINAL_COLUMNS)
+        # Same tender on several sources → one record listing all of them
+        with timing.span("dedup"):
+            combined_df, run_stats["dedup"] = dedupe(combined_df)
+        for line in format_dedup_stats(run_stats["dedup"]):
+            print(line)
 
-        combined_df.to_excel(COMBINED_FILE, index=False, engine="openpyxl")
+        # Soonest deadline first (registry order within a day). Expired rows
+        # were dropped per source as they streamed in; those that expired
+        # since (a run crossing midnight in DEADLINE_TZ) are cut off the
+        # front of the sorted frame with one binary search
+        combined_df = sort_by_deadline(combined_df)
+        if DROP_EXPIRED:
+            combined_df, expired = drop_expired(combined_df)
+            if expired:
+                print(f"🗓 {expired} postings expired during the run")
 
-        format_excel(COMBINED_FILE)
+        written = write_dataset(combined_df, OUTPUT_DIR)
 
         print("📁 Output directory:", OUTPUT_DIR)
-        print("📄 Combined file created at:", COMBINED_FILE)
+        for fmt, path in written.items():
+            print(f"📄 {fmt} written: {path}")
         print("🎉 Scraping process completed successfully!")
 
         return COMBINED_FILE
@@ -234,10 +359,49 @@ def run_all_scrapers_and_combine():
         traceback.print_exc()
         return None
 
+    finally:
+        if stream is not None:
+            write_run_report(scrapers, stream, run_stats, started)
+
 
 # ======================================================
 # ENTRY POINT
 # ======================================================
 
 if __name__ == "__main__":
-    run_all_scrapers_and_combine()
+    parser = argparse.ArgumentParser(description="Run all job scrapers and build Combined.xlsx")
+    parser.add_argument(
+        "--sequential",
+        action="store_true",
+        help="run the scrapers one after another in this process"
+    )
+    parser.add_argument(
+        "--sources",
+        help="comma-separated scrapers to run (default: every registered scraper)"
+    )
+    network = parser.add_mutually_exclusive_group()
+    network.add_argument(
+        "--record",
+        nargs="?",
+        const=replay.archive_dir(),
+        metavar="DIR",
+        help="archive every HTTP response of this run (default: %(const)s)"
+    )
+    network.add_argument(
+        "--replay",
+        nargs="?",
+        const=replay.archive_dir(),
+        metavar="DIR",
+        help="serve responses from an archive recorded with --record instead of the network"
+    )
+    args = parser.parse_args()
+
+    if args.record:
+        replay.configure("record", args.record)
+        print("📼 Recording responses to", args.record)
+    elif args.replay:
+        replay.configure("replay", args.replay)
+        print("📼 Replaying responses from", args.replay)
+
+    sources = [s.strip() for s in args.sources.split(",")] if args.sources else None
+    run_all_scrapers_and_combine(parallel=not args.sequential, sources=sources)
@@ -0,0 +1,163 @@
+import asyncio
+import threading
+
+from playwright.async_api import async_playwright
+
+from scrapers.browser import MEASURE_JS, launch_chromium_async, record_metrics
+from scrapers.readiness import drive_async, scroll_steps, selector_steps
+from scrapers.timing import span
+
+
+# ======================================================
+# ASYNC READINESS
+# ======================================================
+async def wait_for_selector(page, selector, timeout=15):
+    """``readiness.wait_for_selector`` for a ``playwright.async_api`` page."""
+    return await drive_async(page, selector_steps(page, selector, timeout))
+
+
+async def scroll_until_stable(page, timeout=30, quiet=1.0, max_rounds=50, interval=0.1):
+    """``readiness.scroll_until_stable`` for a ``playwright.async_api`` page."""
+    return await drive_async(page, scroll_steps(page, timeout, quiet, max_rounds, interval))
+
+
+async def measure_page(page):
+    try:
+        record_metrics(page.url, await page.evaluate(f"() => ({MEASURE_JS})"))
+    except Exception:
+        pass
+
+
+# ======================================================
+# PAGE DRIVER INTERFACE
+# ======================================================
+class PageDriver:
+    """
+    How one source navigates its pages inside the engine.
+
+    ``listing`` and ``detail`` are coroutines that receive a fresh page and a
+    URL and return the rendered HTML (or None). The defaults wait for the
+    class selectors; sources override them for scrolling, clicks, etc.
+    """
+
+    source = None
+    listing_selector = None
+    detail_selector = None
+    goto_timeout = 60
+
+    async def goto(self, page, url):
+        with span("navigation"):
+            await page.goto(url, timeout=self.goto_timeout * 1000, wait_until="domcontentloaded")
+
+    async def listing(self, page, url):
+        await self.goto(page, url)
+        if self.listing_selector and not await wait_for_selector(page, self.listing_selector):
+            return None
+        return await page.content()
+
+    async def detail(self, page, url):
+        await self.goto(page, url)
+        if self.detail_selector and not await wait_for_selector(page, self.detail_selector):
+            return None
+        return await page.content()
+
+
+# ======================================================
+# ENGINE
+# ======================================================
+class AsyncBrowserEngine:
+    """
+    One headless Chromium serving up to ``concurrency`` pages at once.
+
+    The engine owns an asyncio loop on a background thread, so synchronous
+    scrapers can hand it a batch of URLs with ``render_many`` and get the
+    HTML back in order. The browser is launched on first use only; when
+    every page is served over HTTP it never starts.
+    """
+
+    def __init__(self, driver, concurrency=4):
+        self.driver = driver
+        self.concurrency = max(1, int(concurrency))
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+
+        self._playwright = None
+        self._browser = None
+        self._context = None
+        self._semaphore = None
+        self._start_lock = None
+
+    # --------------------------------------------------
+    # lifecycle (runs on the engine loop)
+    # --------------------------------------------------
+
+    async def _ensure_browser(self):
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+
+        async with self._start_lock:
+            if self._context is None:
+                self._playwright = await async_playwright().start()
+                self._browser, self._context = await launch_chromium_async(
+                    self._playwright, self.driver.source
+                )
+
+    async def _render(self, kind, url):
+        async with self._semaphore:
+            page = await self._context.new_page()
+            try:
+                with span("render"):
+                    html = await getattr(self.driver, kind)(page, url)
+                await measure_page(page)
+                return html
+            except Exception as e:
+                print(f"⚠ {self.driver.source} {kind} {url}: {e}")
+                return None
+            finally:
+                await page.close()
+
+    async def _render_many(self, kind, urls):
+        await self._ensure_browser()
+        return await asyncio.gather(*(self._render(kind, url) for url in urls))
+
+    async def _shutdown(self):
+        if self._browser is not None:
+            await self._browser.close()
+        if self._playwright is not None:
+            await self._playwright.stop()
+
+    # --------------------------------------------------
+    # synchronous API
+    # --------------------------------------------------
+
+    def render_many(self, kind, urls):
+        """Render ``urls`` with ``driver.<kind>`` concurrently; HTML in input order."""
+        urls = list(urls)
+        if not urls:
+            return []
+        future = asyncio.run_coroutine_threadsafe(self._render_many(kind, urls), self._loop)
+        return future.result()
+
+    def renderer(self, kind):
+        """A ``render_many`` callable bound to one page kind, for Fetcher."""
+        return lambda urls: self.render_many(kind, urls)
+
+    def close(self):
+        try:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result(timeout=30)
+        except Exception:
+            pass
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+            if not self._thread.is_alive():
+                self._loop.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,311 @@
+import os
+import json
+import base64
+import threading
+from collections import defaultdict, namedtuple
+from urllib.parse import urlsplit
+
+from selenium import webdriver
+
+from scrapers import replay
+from scrapers.readiness import evaluate
+from scrapers.timing import span
+
+# ======================================================
+# CONFIG
+# ======================================================
+# Set SCRAPER_BLOCK_RESOURCES=0 to load pages in full (for before/after numbers)
+BLOCK_RESOURCES = os.getenv("SCRAPER_BLOCK_RESOURCES", "1") != "0"
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/120 Safari/537.36"
+
+BLOCK_TYPES = ("image", "font", "media")
+
+TRACKER_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "facebook.net",
+    "facebook.com",
+    "hotjar.com",
+    "clarity.ms",
+    "linkedin.com",
+    "licdn.com",
+    "twitter.com",
+    "segment.io",
+    "mixpanel.com",
+    "newrelic.com",
+    "nr-data.net",
+    "hs-analytics.net",
+    "hubspot.com",
+)
+
+# A JSON response read back from a capturing driver, with its request
+CapturedResponse = namedtuple("CapturedResponse", ["url", "method", "post_data", "payload"])
+
+# URL patterns used for Chrome DevTools blocking, per resource type
+TYPE_PATTERNS = {
+    "image": ("*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.svg*", "*.ico*", "*.avif*"),
+    "font": ("*.woff*", "*.woff2*", "*.ttf*", "*.otf*", "*.eot*"),
+    "media": ("*.mp4*", "*.webm*", "*.mp3*", "*.ogg*", "*.m3u8*"),
+}
+
+
+# ======================================================
+# BLOCKING POLICY
+# ======================================================
+class BlockPolicy:
+    """
+    Which requests a browser session may skip.
+
+    ``allow_types`` and ``allow_hosts`` are per-source exceptions: a resource
+    type the site needs to render, or a host (and its subdomains) that must
+    never be blocked.
+    """
+
+    def __init__(self, block_types=BLOCK_TYPES, block_hosts=TRACKER_HOSTS,
+                 allow_types=(), allow_hosts=(), enabled=BLOCK_RESOURCES):
+        self.block_types = tuple(t for t in block_types if t not in allow_types)
+        self.allow_hosts = tuple(allow_hosts)
+        self.block_hosts = tuple(h for h in block_hosts if not self._host_in(h, self.allow_hosts))
+        self.enabled = enabled
+
+    @staticmethod
+    def _host_in(host, hosts):
+        return any(host == h or host.endswith("." + h) for h in hosts)
+
+    def blocks(self, url, resource_type):
+        if not self.enabled:
+            return False
+
+        host = urlsplit(url).hostname or ""
+        if self._host_in(host, self.allow_hosts):
+            return False
+
+        return resource_type in self.block_types or self._host_in(host, self.block_hosts)
+
+    def url_patterns(self):
+        """Patterns for Chrome DevTools ``Network.setBlockedURLs``."""
+        if not self.enabled:
+            return []
+
+        patterns = [p for t in self.block_types for p in TYPE_PATTERNS.get(t, ())]
+        patterns += [f"*://*.{h}/*" for h in self.block_hosts]
+        patterns += [f"*://{h}/*" for h in self.block_hosts]
+        return patterns
+
+
+SOURCE_POLICIES = {
+    "C40": BlockPolicy(),
+    # Oracle Candidate Experience draws its controls with an icon font; the
+    # job list itself is plain DOM text, so images, media and trackers stay
+    # blocked (and images stay disabled in Chrome)
+    "ESTM": BlockPolicy(allow_types=("font",)),
+    "DevelopmentAid": BlockPolicy(),
+    "onepurpos": BlockPolicy(),
+}
+
+
+def policy_for(source):
+    return SOURCE_POLICIES.get(source) or BlockPolicy()
+
+
+# ======================================================
+# NETWORK MEASUREMENT
+# ======================================================
+# host → {"pages", "bytes", "resources", "load_ms", "blocked"}
+NETWORK_LOG = defaultdict(lambda: defaultdict(float))
+_log_lock = threading.Lock()
+
+MEASURE_JS = """(() => {
+    const nav = performance.getEntriesByType('navigation')[0];
+    const res = performance.getEntriesByType('resource');
+    let bytes = nav ? (nav.transferSize || 0) : 0;
+    for (const r of res) bytes += r.transferSize || 0;
+    const end = nav ? (nav.loadEventEnd || nav.domContentLoadedEventEnd || nav.responseEnd) : 0;
+    return {bytes: bytes, resources: res.length, load_ms: end};
+})()"""
+
+
+def measure_page(page):
+    """
+    Record bytes transferred and load time of the current document.
+
+    Uses the Resource Timing API, so cross-origin resources without a
+    Timing-Allow-Origin header count as 0 bytes; compare runs with
+    SCRAPER_BLOCK_RESOURCES=0 and =1 on the same pages.
+    """
+    try:
+        metrics = evaluate(page, MEASURE_JS)
+        url = page.current_url if hasattr(page, "current_url") else page.url
+    except Exception:
+        return None
+
+    record_metrics(url, metrics)
+    return metrics
+
+
+def record_metrics(url, metrics):
+    host = urlsplit(url).netloc or "unknown"
+    with _log_lock:
+        entry = NETWORK_LOG[host]
+        entry["pages"] += 1
+        entry["bytes"] += metrics.get("bytes") or 0
+        entry["resources"] += metrics.get("resources") or 0
+        entry["load_ms"] += metrics.get("load_ms") or 0
+
+
+def _count_blocked(url):
+    host = urlsplit(url).netloc or "unknown"
+    with _log_lock:
+        NETWORK_LOG[host]["blocked"] += 1
+
+
+def network_stats():
+    with _log_lock:
+        return {host: dict(values) for host, values in NETWORK_LOG.items()}
+
+
+def format_stats(stats):
+    lines = []
+    for host, v in sorted(stats.items()):
+        pages = v.get("pages", 0)
+        if not pages:
+            continue
+        lines.append(
+            f"📶 {host}: {int(pages)} pages, {v.get('bytes', 0) / 1024 / pages:.0f} KiB/page, "
+            f"{v.get('load_ms', 0) / pages:.0f} ms/page load, {int(v.get('blocked', 0))} requests blocked"
+        )
+    return lines
+
+
+# ======================================================
+# SELENIUM
+# ======================================================
+def new_chrome_driver(source, service=None, extra_args=(), capture_network=False):
+    """
+    Headless Chrome with the source's blocking policy applied over CDP.
+
+    With ``capture_network`` the driver keeps Chrome's performance log, so
+    the responses a page loads can be read back with ``captured_json``.
+    """
+    policy = policy_for(source)
+
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--window-size=1920,1080")
+    for arg in (*extra_args, *replay.chrome_args()):
+        options.add_argument(arg)
+
+    if policy.enabled and "image" in policy.block_types and not policy.allow_hosts:
+        options.add_argument("--blink-settings=imagesEnabled=false")
+
+    if capture_network:
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+    kwargs = {"options": options}
+    if service is not None:
+        kwargs["service"] = service
+    with span("browser_launch"):
+        driver = webdriver.Chrome(**kwargs)
+
+    patterns = policy.url_patterns()
+    if patterns:
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        except Exception as e:
+            print(f"⚠ {source}: request blocking unavailable ({e})")
+
+    return driver
+
+
+def captured_json(driver, url_filter=None):
+    """
+    Every XHR/fetch JSON response the driver received since the last call,
+    as ``CapturedResponse`` (request method and body included), read from
+    the performance log of a driver started with ``capture_network``;
+    ``url_filter`` keeps only matching URLs.
+    """
+    requests, responses = {}, []
+    for entry in driver.get_log("performance"):
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError):
+            continue
+
+        params = message.get("params", {})
+        if message.get("method") == "Network.requestWillBeSent":
+            requests[params.get("requestId")] = params.get("request", {})
+            continue
+        if message.get("method") != "Network.responseReceived":
+            continue
+
+        response = params.get("response", {})
+        if params.get("type") not in ("XHR", "Fetch") or "json" not in response.get("mimeType", ""):
+            continue
+        if url_filter is not None and not url_filter(response.get("url", "")):
+            continue
+
+        try:
+            body = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": params["requestId"]})
+            text = base64.b64decode(body["body"]) if body.get("base64Encoded") else body["body"]
+            payload = json.loads(text)
+        except Exception:
+            # evicted from the buffer or not JSON after all
+            continue
+
+        request = requests.get(params["requestId"], {})
+        responses.append(CapturedResponse(
+            response["url"], request.get("method", "GET"), request.get("postData"), payload
+        ))
+
+    return responses
+
+
+# ======================================================
+# PLAYWRIGHT
+# ======================================================
+def async_route_handler(policy):
+    async def handle(route):
+        request = route.request
+        if policy.blocks(request.url, request.resource_type):
+            _count_blocked(request.url)
+            await route.abort()
+        elif replay.active():
+            await replay.serve_route_async(route)
+        else:
+            await route.continue_()
+
+    return handle
+
+
+async def launch_chromium_async(playwright, source):
+    """
+    Launch headless Chromium on ``playwright.async_api`` and return
+    (browser, context) with the source's blocking policy applied.
+    """
+    with span("browser_launch"):
+        browser = await playwright.chromium.launch(
+            headless=True,
+            args=[
+                "--no-sandbox",
+                "--disable-dev-shm-usage",
+                "--disable-blink-features=AutomationControlled"
+            ]
+        )
+
+        context = await browser.new_context(
+            user_agent=USER_AGENT,
+            viewport={"width": 1920, "height": 1080}
+        )
+
+    policy = policy_for(source)
+    if policy.enabled or replay.active():
+        await context.route("**/*", async_route_handler(policy))
+
+    return browser, context
@@ -1,162 +1,172 @@
-import time
-import re
+import os
+
 import pandas as pd
-from playwright.sync_api import sync_playwright
+
+from scrapers.async_engine import AsyncBrowserEngine, PageDriver, scroll_until_stable, wait_for_selector
+from scrapers.classifier import classify, label
+from scrapers.deadlines import DROP_EXPIRED
+from scrapers.extract import CardSpec, Field
+from scrapers.fetch import Fetcher, select_text
+from scrapers.pushdown import DEADLINE, DEDUP, FetchPlan
+from scrapers.registry import Scraper, register
 
 # ======================================================
 # CONFIG
 # ======================================================
-C40_RFP_URL = "https://www.c40.org/work-with-c40/"
+# Override to point at a fixture site (benchmarks/sites.py)
+C40_RFP_URL = os.getenv("C40_URL", "https://www.c40.org/work-with-c40/")
 
-# ======================================================
-# KEYWORDS
-# ======================================================
-KEYWORDS = {
-    "Governance": [
-        "governance", "policy", "capacity building", "municipal", "m&e",
-        "monitoring and evaluation", "social audits", "fundraising",
-        "management", "consulting", "consultant", "consultancy",
-        "administration", "public", "government", "capacity",
-        "impact", "evaluation", "dashboard", "data",
-        "strategy", "framework", "tool", "technology",
-        "knowledge", "csr", "philanthropy", "business",
-        "entrepreneurship", "entrepreneurs", "shg",
-        "development", "urban", "infrastructure", "city",
-        "housing", "parks", "planning", "guidelines",
-        "implementation", "technical assistance",
-        "project", "program", "scheme"
-    ],
-    "Learning": [
-        "education", "skill", "skills", "training", "life skills",
-        "tvet", "student", "learning by doing",
-        "teaching", "curriculum", "schools", "colleges",
-        "educational institutes", "ai", "skilling",
-        "digital learning", "edtech"
-    ],
-    "Safety": [
-        "gender", "women", "equity", "safety", "mobility",
-        "sexual", "health", "security", "protection",
-        "child", "children", "lgbtq", "wellbeing", "wash"
-    ],
-    "Climate": [
-        "climate", "resilience", "environment", "disaster",
-        "sustainability", "green", "renewable", "energy",
-        "pollution", "waste", "sanitation", "flood", "heat"
-    ]
+# Pages that may be served over plain HTTP before falling back to Chromium
+FAST_PATH = {
+    "listing": True,
+    "detail": True
 }
 
-# ======================================================
-# MATCHING LOGIC
-# ======================================================
-def match_verticals(title, description):
-    text = f"{title} {description}".lower()
-    matched = []
+CARD_SELECTOR = "a.link-cards-item"
 
-    for vertical, words in KEYWORDS.items():
-        for w in set(words):
-            if re.search(rf"\b{re.escape(w.lower())}\b", text):
-                matched.append(vertical)
-                break
+# Matching is on the listing fields (title + deadline). Set this to the
+# element holding an RFP's own text to also read detail pages; never the
+# whole <main>, whose site boilerplate matches nearly every vertical.
+DESCRIPTION_SELECTOR = os.getenv("C40_DESCRIPTION_SELECTOR", "")
 
-    return ", ".join(matched) if matched else "N/A"
+CARDS = CardSpec(CARD_SELECTOR, title="h3", deadline="h4", link=Field(attr="href"))
+DESCRIPTION_LIMIT = 3000
 
+# Pages rendered at once by the async engine
+CONCURRENCY = int(os.getenv("C40_CONCURRENCY", "4"))
 
 # ======================================================
-# MAIN SCRAPER
+# BROWSER NAVIGATION (ASYNC ENGINE)
 # ======================================================
-def scrape_c40_jobs():
-    data = []
-
-    with sync_playwright() as p:
-        browser = p.chromium.launch(
-            headless=True,
-            args=[
-                "--no-sandbox",
-                "--disable-dev-shm-usage",
-                "--disable-blink-features=AutomationControlled"
-            ]
-        )
-
-        context = browser.new_context(
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/120 Safari/537.36",
-            viewport={"width": 1920, "height": 1080}
-        )
+class C40PageDriver(PageDriver):
+    source = "C40"
+    listing_selector = CARD_SELECTOR
+    detail_selector = DESCRIPTION_SELECTOR or None
 
-        page = context.new_page()
-
-        print("🔍 Opening C40 page...")
-        page.goto(C40_RFP_URL, timeout=60000, wait_until="domcontentloaded")
+    async def listing(self, page, url):
+        print("🔍 Opening C40 page in browser...")
+        await self.goto(page, url)
 
         # ✅ Wait for content
-        try:
-            page.wait_for_selector("a.link-cards-item", timeout=15000)
-        except:
+        if not await wait_for_selector(page, CARD_SELECTOR, timeout=15):
             print("⚠ Initial load failed, trying scroll...")
 
-        # ✅ Force scroll (important for GitHub)
-        for _ in range(6):
-            page.mouse.wheel(0, 5000)
-            time.sleep(2)
-
-        time.sleep(3)
-
-        # ======================================================
-        # 🔥 DIRECT PLAYWRIGHT SELECTOR (NO BS4)
-        # ======================================================
-        cards = page.locator("a.link-cards-item")
-        count = cards.count()
+        # ✅ Scroll until no more cards load (important for GitHub)
+        await scroll_until_stable(page, timeout=30, quiet=2)
+        return await page.content()
 
-        print(f"✅ Found {count} RFPs")
-
-        for i in range(count):
-            try:
-                card = cards.nth(i)
-
-                title = card.locator("h3").inner_text() if card.locator("h3").count() > 0 else "N/A"
-                deadline = card.locator("h4").inner_text() if card.locator("h4").count() > 0 else "N/A"
-                link = card.get_attribute("href")
+# ======================================================
+# LISTING PARSER
+# ======================================================
+def parse_listing(soup):
+    data = []
 
-                # fix relative link
-                if link and link.startswith("/"):
-                    link = "https://www.c40.org" + link
+    # relative links are resolved against the listing URL
+    for card in CARDS.extract_soup(soup, C40_RFP_URL):
+        title = card["title"] or "N/A"
+        deadline = card["deadline"] or "N/A"
 
-                description = f"{title} {deadline}"
+        data.append({
+            "Title": title,
+            "Description": f"{title} {deadline}",
+            "Deadline": deadline,
+            "Apply_Link": card["link"]
+        })
 
-                matched_vertical = match_verticals(title, description)
+    return data
 
-                if matched_vertical == "N/A":
+# ======================================================
+# MAIN SCRAPER
+# ======================================================
+COLUMNS = ["Title", "Description", "Matched_Vertical", "Deadline", "Apply_Link"]
+
+
+def iter_c40_jobs(concurrency=CONCURRENCY):
+    """Yield matched RFPs; with C40_DESCRIPTION_SELECTOR, as soon as their detail page is in."""
+    print("🔍 Opening C40 page...")
+
+    with Fetcher("C40") as fetcher, AsyncBrowserEngine(C40PageDriver(), concurrency) as engine:
+        soup = fetcher.fetch_many(
+            [C40_RFP_URL],
+            CARD_SELECTOR,
+            fast=FAST_PATH["listing"],
+            render_many=engine.renderer("listing")
+        )[0]
+
+        data = parse_listing(soup)
+        print(f"✅ Found {len(data)} RFPs")
+
+        # 🔽 expired and repeated RFPs are dropped before matching; keywords
+        # are not pushed down since opted-in detail text may still match
+        plan = FetchPlan("C40", {DEDUP} | ({DEADLINE} if DROP_EXPIRED else set()))
+        data = [
+            row for row, _ in plan.plan(data, lambda row: (row["Title"], row["Deadline"], row["Apply_Link"]))
+        ]
+        plan.report()
+
+        # rows are classified on the listing text alone unless detail pages
+        # are opted in; rows without a detail page always are
+        rows = {}
+        for row in data:
+            if DESCRIPTION_SELECTOR and row["Apply_Link"]:
+                rows.setdefault(row["Apply_Link"], []).append(row)
+                continue
+
+            result = classify(f"{row['Title']} {row['Description']}", "C40")
+            if result.verticals:
+                row["Matched_Vertical"] = label(result)
+                yield row
+
+        # 🔥 detail pages overlap: HTTP pool first, then one browser batch
+        for link, page in fetcher.iter_many(
+            list(rows),
+            DESCRIPTION_SELECTOR,
+            fast=FAST_PATH["detail"],
+            render_many=engine.renderer("detail")
+        ):
+            text = select_text(page, DESCRIPTION_SELECTOR)
+
+            for row in rows[link]:
+                if text:
+                    row["Description"] = text[:DESCRIPTION_LIMIT]
+
+                result = classify(f"{row['Title']} {row['Description']}", "C40")
+                if not result.verticals:
                     continue
 
-                data.append({
-                    "Title": title,
-                    "Description": description,
-                    "Matched_Vertical": matched_vertical,
-                    "Deadline": deadline,
-                    "Apply_Link": link
-                })
+                row["Matched_Vertical"] = label(result)
+                print(f"✔️ {row['Title']} → {row['Matched_Vertical']}")
+                yield row
 
-                print(f"✔️ {title} → {matched_vertical}")
+        fetcher.report()
 
-            except Exception as e:
-                print(f"⚠ Error: {e}")
 
-        browser.close()
+def scrape_c40_jobs(concurrency=CONCURRENCY):
+    matched = list(iter_c40_jobs(concurrency))
 
-    # ======================================================
-    # DATAFRAME
-    # ======================================================
-    if not data:
+    if not matched:
         print("❌ No relevant data found")
-        return pd.DataFrame(columns=[
-            "Title", "Description", "Matched_Vertical", "Deadline", "Apply_Link"
-        ])
+        return pd.DataFrame(columns=COLUMNS)
 
-    df = pd.DataFrame(data)
+    df = pd.DataFrame(matched, columns=COLUMNS)
 
     print(f"✅ Final records: {len(df)}")
     return df
 
 
+# ======================================================
+# PLUGIN
+# ======================================================
+@register
+class C40Scraper(Scraper):
+    name = "C40"
+    order = 20
+    time_budget = 5 * 60
+
+    def records(self):
+        return iter_c40_jobs()
+
+
 # ======================================================
 # RUN
 # ======================================================
@@ -0,0 +1,236 @@
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import Counter, defaultdict, namedtuple
+
+from scrapers import replay
+from scrapers.store import PROJECT_ROOT, canonical_link
+
+# ======================================================
+# CONFIG
+# ======================================================
+CACHE_DIR = os.getenv("PAGE_CACHE_DIR", os.path.join(PROJECT_ROOT, "output", "cache"))
+
+# Set PAGE_CACHE=0 to always go to the network
+CACHE_ENABLED = os.getenv("PAGE_CACHE", "1") != "0"
+
+MAX_BYTES = int(float(os.getenv("PAGE_CACHE_MAX_MB", "200")) * 1024 * 1024)
+
+DEFAULT_TTL = float(os.getenv("PAGE_CACHE_TTL", str(6 * 3600)))
+
+# Seconds a cached page of each source counts as fresh
+SOURCE_TTLS = {
+    "C40": 6 * 3600,
+    "ESTM": 3600,
+    "DevelopmentAid": 12 * 3600,
+    "onepurpos": 12 * 3600,
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key           TEXT PRIMARY KEY,
+    url           TEXT NOT NULL,
+    source        TEXT NOT NULL,
+    kind          TEXT NOT NULL,
+    size          INTEGER NOT NULL,
+    etag          TEXT,
+    last_modified TEXT,
+    stored_at     REAL NOT NULL,
+    accessed_at   REAL NOT NULL
+)
+"""
+
+CacheEntry = namedtuple("CacheEntry", ["body", "fresh", "etag", "last_modified"])
+
+# Per-source counters for this process (hit, miss, stale, revalidated, stored, evicted)
+STATS = defaultdict(Counter)
+
+
+def cache_stats():
+    return {source: dict(counts) for source, counts in STATS.items()}
+
+
+# ======================================================
+# PAGE CACHE
+# ======================================================
+class PageCache:
+    """
+    On-disk cache of fetched pages for one source.
+
+    Bodies live in ``CACHE_DIR/<aa>/<key>`` files; an SQLite index holds the
+    URL, validators (ETag / Last-Modified) and timestamps. Entries are fresh
+    for the source TTL; stale entries that carry validators are revalidated
+    by the caller with a conditional request. When the cache grows past
+    MAX_BYTES the least recently used entries are evicted.
+
+    ``kind`` separates raw HTTP responses from browser-rendered HTML of the
+    same URL. Recording and replaying runs bypass the cache so every page
+    goes through the archive.
+    """
+
+    def __init__(self, source, cache_dir=CACHE_DIR, ttl=None, max_bytes=MAX_BYTES,
+                 enabled=None):
+        if enabled is None:
+            enabled = CACHE_ENABLED and not replay.active()
+
+        self.source = source
+        self.cache_dir = cache_dir
+        self.ttl = ttl if ttl is not None else SOURCE_TTLS.get(source, DEFAULT_TTL)
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.stats = STATS[source]
+
+        self._lock = threading.Lock()
+        self._conn = None
+
+        if enabled:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._conn = sqlite3.connect(
+                os.path.join(cache_dir, "index.db"), timeout=30, check_same_thread=False
+            )
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(SCHEMA)
+            self._conn.commit()
+
+    # --------------------------------------------------
+    # helpers
+    # --------------------------------------------------
+
+    def _key(self, url, kind):
+        return hashlib.sha256(f"{kind}:{canonical_link(url)}".encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def _count(self, name, n=1):
+        with self._lock:
+            self.stats[name] += n
+
+    # --------------------------------------------------
+    # lookup / store
+    # --------------------------------------------------
+
+    def get(self, url, kind="http"):
+        """Return a CacheEntry (fresh or stale) or None on a miss."""
+        if not self.enabled:
+            return None
+
+        key = self._key(url, kind)
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, stored_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                body = f.read()
+        except OSError:
+            row = None
+
+        if row is None:
+            self._count("miss")
+            return None
+
+        fresh = time.time() - row[2] < self.ttl
+
+        with self._lock:
+            self._conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+
+        self._count("hit" if fresh else "stale")
+        return CacheEntry(body, fresh, row[0], row[1])
+
+    def put(self, url, body, kind="http", etag=None, last_modified=None):
+        if not self.enabled or body is None:
+            return
+
+        key = self._key(url, kind)
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(body)
+        os.replace(tmp, path)
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries "
+                "(key, url, source, kind, size, etag, last_modified, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, self.source, kind, os.path.getsize(path), etag, last_modified, now, now)
+            )
+            self._conn.commit()
+
+        self._count("stored")
+        self.evict()
+
+    def refresh(self, url, kind="http"):
+        """Mark a stale entry fresh again after a 304 Not Modified."""
+        if not self.enabled:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE entries SET stored_at = ?, accessed_at = ? WHERE key = ?",
+                (now, now, self._key(url, kind))
+            )
+            self._conn.commit()
+
+        self._count("revalidated")
+
+    # --------------------------------------------------
+    # eviction
+    # --------------------------------------------------
+
+    def evict(self):
+        with self._lock:
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+
+            victims = []
+            for key, size in self._conn.execute(
+                "SELECT key, size FROM entries ORDER BY accessed_at ASC"
+            ):
+                if total <= self.max_bytes:
+                    break
+                victims.append(key)
+                total -= size
+
+            self._conn.executemany("DELETE FROM entries WHERE key = ?", [(k,) for k in victims])
+            self._conn.commit()
+            self.stats["evicted"] += len(victims)
+
+        for key in victims:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+# ======================================================
+# SUMMARY
+# ======================================================
+def format_stats(stats):
+    lines = []
+    for source, counts in sorted(stats.items()):
+        lookups = counts.get("hit", 0) + counts.get("miss", 0) + counts.get("stale", 0)
+        served = counts.get("hit", 0) + counts.get("revalidated", 0)
+        rate = served / lookups * 100 if lookups else 0.0
+        lines.append(
+            f"🗄 {source} cache: {counts.get('hit', 0)} hits, {counts.get('miss', 0)} misses, "
+            f"{counts.get('revalidated', 0)}/{counts.get('stale', 0)} stale revalidated, "
+            f"{counts.get('evicted', 0)} evicted ({rate:.0f}% served from cache)"
+        )
+    return lines
@@ -0,0 +1,119 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+
+from scrapers import replay
+from scrapers.store import DB_PATH, INCREMENTAL
+
+# ======================================================
+# CONFIG
+# ======================================================
+# An unfinished crawl older than this is started over instead of resumed
+RESUME_HOURS = float(os.getenv("CRAWL_RESUME_HOURS", "12"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS crawl_pages (
+    source     TEXT NOT NULL,
+    search     TEXT NOT NULL,
+    page       INTEGER NOT NULL,
+    items      TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (source, search, page)
+)
+"""
+
+
+# ======================================================
+# CHECKPOINT
+# ======================================================
+class CrawlCheckpoint:
+    """
+    Completed result pages of one paginated search, kept next to the
+    postings store.
+
+    A crawl calls ``complete`` for each page it finishes and ``finish`` when
+    it got to the end. A crawl cut short (time budget, crash) leaves its
+    pages behind; the next crawl of the same ``search`` within RESUME_HOURS
+    takes the completed pages from ``resume`` and only requests the rest.
+    """
+
+    def __init__(self, source, search, path=DB_PATH, enabled=None):
+        if enabled is None:
+            enabled = INCREMENTAL and not replay.active()
+
+        self.source = source
+        self.search = search
+        self.enabled = enabled
+        self.resumed = 0
+
+        self._lock = threading.Lock()
+        self._conn = None
+
+        if enabled:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(SCHEMA)
+            self._conn.commit()
+
+    def resume(self):
+        """Items of the completed pages 1..n as ``{page: items}``, n being the last page completed."""
+        if not self.enabled:
+            return {}
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT page, items FROM crawl_pages WHERE source = ? AND search = ? AND fetched_at > ? "
+                "ORDER BY page",
+                (self.source, self.search, time.time() - RESUME_HOURS * 3600)
+            ).fetchall()
+
+        # pages finish out of order; only the unbroken run from page 1 counts
+        pages = {}
+        for page, items in rows:
+            if page != len(pages) + 1:
+                break
+            pages[page] = json.loads(items)
+
+        self.resumed = len(pages)
+        return pages
+
+    def complete(self, page, items):
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO crawl_pages (source, search, page, items, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (self.source, self.search, page, json.dumps(items), time.time())
+            )
+            self._conn.commit()
+
+    def finish(self):
+        """The crawl got to its end; the next one starts from page 1."""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM crawl_pages WHERE source = ? AND search = ?", (self.source, self.search)
+            )
+            self._conn.commit()
+
+    def report(self):
+        if self.enabled and self.resumed:
+            print(f"📍 {self.source} crawl resumed after page {self.resumed}")
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,180 @@
+import os
+import re
+import json
+from collections import namedtuple
+from functools import lru_cache
+
+import pandas as pd
+
+from scrapers.timing import span
+
+# ======================================================
+# CONFIG
+# ======================================================
+# source → vertical → keywords; sources without their own set use "default"
+KEYWORDS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "keywords.json")
+DEFAULT_KEYWORDS = "default"
+
+Classification = namedtuple("Classification", ["verticals", "terms"])
+
+NO_MATCH = Classification((), ())
+
+
+# ======================================================
+# TRIE → REGEX
+# ======================================================
+def _trie_pattern(terms):
+    """
+    Build one regex alternation from a character trie of ``terms``.
+
+    Shared prefixes are factored out (``capacity(?: building)?``) so matching
+    at a position costs O(term length) no matter how many terms there are.
+    Longer continuations are tried first.
+    """
+    trie = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def build(node):
+        end = "" in node
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+
+        if not branches:
+            return ""
+
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return "(?:" + body + ")?" if end else body
+
+    return build(trie)
+
+
+# ======================================================
+# CLASSIFIER
+# ======================================================
+class KeywordClassifier:
+    """
+    Whole-word, case-insensitive keyword matcher for all verticals of one
+    keyword set.
+
+    Every keyword of every vertical is compiled into a single regex, and a
+    text is scanned once. The result holds every matched vertical (in
+    keywords.json order) and the keywords that triggered them.
+    """
+
+    def __init__(self, keywords):
+        self.verticals = list(keywords)
+        self.term_verticals = {}
+
+        for vertical, words in keywords.items():
+            for word in words:
+                term = word.strip().lower()
+                if not term:
+                    continue
+                verticals = self.term_verticals.setdefault(term, [])
+                if vertical not in verticals:
+                    verticals.append(vertical)
+
+        # One lookahead match per start position; the trie prefers the
+        # longest term there, so shorter terms that are word-prefixes of it
+        # ("capacity" in "capacity building") are added back explicitly.
+        self.nested = {
+            term: [
+                other for other in self.term_verticals
+                if other != term
+                and term.startswith(other)
+                and re.match(r"\w\W", term[len(other) - 1:]) is not None
+            ]
+            for term in self.term_verticals
+        }
+
+        self.pattern = re.compile(
+            r"(?=\b(" + _trie_pattern(self.term_verticals) + r")\b)",
+            re.IGNORECASE
+        )
+
+    def classify(self, text):
+        if not isinstance(text, str) or not text:
+            return NO_MATCH
+
+        terms = []
+        seen = set()
+        for match in self.pattern.finditer(text):
+            term = match.group(1).lower()
+            for hit in [term] + self.nested[term]:
+                if hit not in seen:
+                    seen.add(hit)
+                    terms.append(hit)
+
+        if not terms:
+            return NO_MATCH
+
+        matched = set()
+        for term in terms:
+            matched.update(self.term_verticals[term])
+
+        verticals = tuple(v for v in self.verticals if v in matched)
+        return Classification(verticals, tuple(terms))
+
+    def classify_many(self, texts):
+        """Classify a batch; identical texts are only scanned once."""
+        cache = {}
+        results = []
+        for text in texts:
+            if text not in cache:
+                cache[text] = self.classify(text)
+            results.append(cache[text])
+        return results
+
+    def classify_column(self, series, empty=""):
+        """
+        Classify a text column and return a frame with ``Matched_Vertical``
+        and ``Matched_Terms`` (comma-joined strings) aligned to its index.
+        """
+        series = series.fillna("").astype(str)
+        uniques = pd.unique(series)
+        results = dict(zip(uniques, self.classify_many(uniques)))
+
+        return pd.DataFrame(
+            {
+                "Matched_Vertical": series.map(lambda t: label(results[t], empty)),
+                "Matched_Terms": series.map(lambda t: ", ".join(results[t].terms)),
+            },
+            index=series.index
+        )
+
+
+# ======================================================
+# SHARED INSTANCE
+# ======================================================
+def load_keywords(path=KEYWORDS_FILE):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=None)
+def get_classifier(source=None, path=KEYWORDS_FILE):
+    """Classifier over ``source``'s keyword set, or the default set when it has none."""
+    keywords = load_keywords(path)
+    return KeywordClassifier(keywords.get(source) or keywords[DEFAULT_KEYWORDS])
+
+
+def classify(text, source=None):
+    with span("classify"):
+        return get_classifier(source).classify(text)
+
+
+def classify_many(texts, source=None):
+    with span("classify"):
+        return get_classifier(source).classify_many(texts)
+
+
+def classify_column(series, empty="", source=None):
+    with span("classify"):
+        return get_classifier(source).classify_column(series, empty)
+
+
+def label(result, empty=""):
+    return ", ".join(result.verticals) if result.verticals else empty
@@ -0,0 +1,233 @@
+import os
+import re
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+from dateutil import parser as dateutil_parser
+
+# ======================================================
+# CONFIG
+# ======================================================
+# Deadlines are reported as dates in this timezone (the team's)
+DEADLINE_TZ = os.getenv("DEADLINE_TZ", "Asia/Kolkata")
+
+# Postings whose deadline has passed are dropped for every source (before,
+# only OnePurpos filtered them); set DROP_EXPIRED=0 to keep them
+DROP_EXPIRED = os.getenv("DROP_EXPIRED", "1") != "0"
+
+DATE_COLUMN = "Deadline_Date"
+CONFIDENCE_COLUMN = "Deadline_Confidence"
+
+# exact: matched one of the source's formats; fuzzy: free-text parse or no
+# year given; none: empty, "N/A", "Rolling", unparseable
+EXACT, FUZZY, NONE = "exact", "fuzzy", "none"
+
+DeadlineFormat = namedtuple("DeadlineFormat", ["formats", "dayfirst", "tz"])
+
+# How each source writes its deadlines, and the timezone its times are in
+SOURCE_FORMATS = {
+    # h4: "Deadline: 15 November 2025"
+    "c40": DeadlineFormat(
+        ("%d %B %Y", "%d %b %Y", "%B %d, %Y", "%d %B %Y %H:%M", "%d %B %Y, %H:%M", "%d/%m/%Y"),
+        True, "Europe/London"
+    ),
+    # "Apply Before": "09/04/2026, 03:59 AM" (browser), "2026-09-04" (API)
+    "estm": DeadlineFormat(
+        ("%m/%d/%Y, %I:%M %p", "%m/%d/%Y %I:%M %p", "%m/%d/%Y", "%Y-%m-%d"),
+        False, "UTC"
+    ),
+    # tender-deadline: "Nov 30, 2025" / "30 Nov 2025"
+    "developmentaid": DeadlineFormat(
+        ("%b %d, %Y", "%B %d, %Y", "%d %b %Y", "%d %B %Y"),
+        True, "UTC"
+    ),
+    # large-card-date-text: "Aug 24, 2026"
+    "onepurpos": DeadlineFormat(
+        ("%b %d, %Y", "%B %d, %Y", "%d %b %Y", "%d %B %Y"),
+        False, "Asia/Kolkata"
+    ),
+}
+
+DEFAULT_FORMAT = DeadlineFormat(("%Y-%m-%d",), True, "UTC")
+
+NO_DEADLINE = {"", "n/a", "na", "none", "nan", "nat", "tbc", "tbd", "-", "ongoing", "rolling", "open"}
+
+LABEL_RE = re.compile(
+    r"^\s*(?:deadline|apply before|application deadline|closing date|closes(?: on)?|due(?: date)?)\s*[:\-–]?\s*",
+    re.I
+)
+WEEKDAY_RE = re.compile(r"^(?:mon|tue|wed|thu|fri|sat|sun)[a-z]*,?\s+", re.I)
+ORDINAL_RE = re.compile(r"(\d)(?:st|nd|rd|th)\b", re.I)
+YEAR_RE = re.compile(r"\b\d{4}\b")
+
+TZ_ABBREVIATIONS = {
+    "UTC": 0, "GMT": 0, "BST": 1, "CET": 1, "CEST": 2, "EST": -5, "EDT": -4, "IST": 5.5,
+}
+TZ_RE = re.compile(r"\s*\(?\b(" + "|".join(TZ_ABBREVIATIONS) + r")\b\)?\s*$")
+
+Deadline = namedtuple("Deadline", ["date", "confidence"])
+
+
+# ======================================================
+# PARSING
+# ======================================================
+def format_for(source):
+    return SOURCE_FORMATS.get(str(source or "").strip().lower(), DEFAULT_FORMAT)
+
+
+def _clean(text):
+    text = LABEL_RE.sub("", str(text).strip())
+    text = WEEKDAY_RE.sub("", text)
+    text = ORDINAL_RE.sub(r"\1", text)
+    return " ".join(text.split())
+
+
+def _zone(name):
+    return timezone.utc if name == "UTC" else ZoneInfo(name)
+
+
+def _to_date(value, tz, has_time):
+    """Calendar date of ``value`` in DEADLINE_TZ; date-only values are kept as written."""
+    if not has_time:
+        return value.date()
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=tz)
+    return value.astimezone(_zone(DEADLINE_TZ)).date()
+
+
+@lru_cache(maxsize=65536)
+def parse_deadline(text, source=None):
+    """
+    Parse one deadline as written by ``source``.
+
+    Returns ``Deadline(date, confidence)``; ``date`` is a ``datetime.date``
+    in DEADLINE_TZ or None. Results are memoised, since most postings of a
+    run share a handful of deadlines.
+    """
+    if text is None or (isinstance(text, float) and np.isnan(text)):
+        return Deadline(None, NONE)
+
+    spec = format_for(source)
+    text = _clean(text)
+    tz = _zone(spec.tz)
+
+    match = TZ_RE.search(text)
+    if match:
+        tz = timezone(timedelta(hours=TZ_ABBREVIATIONS[match.group(1)]))
+        text = text[:match.start()]
+
+    if text.lower() in NO_DEADLINE:
+        return Deadline(None, NONE)
+
+    try:
+        value = datetime.fromisoformat(text)
+        return Deadline(_to_date(value, tz, "T" in text or " " in text), EXACT)
+    except ValueError:
+        pass
+
+    for fmt in spec.formats:
+        try:
+            value = datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+        return Deadline(_to_date(value, tz, "%H" in fmt or "%I" in fmt), EXACT)
+
+    try:
+        value = dateutil_parser.parse(text, dayfirst=spec.dayfirst, fuzzy=True)
+    except (ValueError, OverflowError):
+        return Deadline(None, NONE)
+
+    date = _to_date(value, tz, bool(value.hour or value.minute))
+
+    # "Closes 3 March" means the next 3 March, not the one that has passed
+    if not YEAR_RE.search(text) and date < today().date():
+        try:
+            date = date.replace(year=date.year + 1)
+        except ValueError:  # 29 February
+            pass
+    return Deadline(date, FUZZY)
+
+
+def parse_deadlines(deadlines, sources=None):
+    """
+    ``parse_deadline`` over a whole column.
+
+    Each distinct (source, text) pair is parsed once; returns a frame with
+    DATE_COLUMN (datetime64, NaT when unknown) and CONFIDENCE_COLUMN,
+    aligned to the index of ``deadlines``.
+    """
+    deadlines = pd.Series(deadlines)
+    if sources is None or isinstance(sources, str):
+        sources = [sources or ""] * len(deadlines)
+
+    # a merged record lists several sources; its deadline came from the first
+    sources = pd.Series(np.asarray(sources, dtype=object), index=deadlines.index)
+    sources = sources.fillna("").astype(str).str.split(",").str[0]
+    texts = deadlines.astype(object).where(deadlines.notna(), None)
+
+    codes, uniques = pd.factorize(pd.Series(list(zip(sources, texts)), dtype=object))
+    parsed = [parse_deadline(text, source) for source, text in uniques]
+
+    dates = np.array([p.date for p in parsed], dtype="datetime64[D]")[codes]
+    confidence = np.array([p.confidence for p in parsed], dtype=object)[codes]
+
+    return pd.DataFrame({
+        DATE_COLUMN: pd.Series(dates, index=deadlines.index).astype("datetime64[s]"),
+        CONFIDENCE_COLUMN: pd.Series(confidence, index=deadlines.index, dtype="string"),
+    })
+
+
+# ======================================================
+# ORDERING / EXPIRY
+# ======================================================
+def today():
+    """Today's date in DEADLINE_TZ, as a naive Timestamp."""
+    return pd.Timestamp.now(tz=DEADLINE_TZ).normalize().tz_localize(None)
+
+
+def add_deadline_columns(df, source=None):
+    """``df`` with the parsed deadline columns (re)computed from ``Deadline``."""
+    parsed = parse_deadlines(df["Deadline"], df["Source"] if source is None else source)
+    df = df.copy()
+    df[DATE_COLUMN] = parsed[DATE_COLUMN]
+    df[CONFIDENCE_COLUMN] = parsed[CONFIDENCE_COLUMN]
+    return df
+
+
+def sort_by_deadline(df):
+    """Soonest deadline first, unknown deadlines last; ties keep their order."""
+    return df.sort_values(DATE_COLUMN, kind="stable", na_position="last").reset_index(drop=True)
+
+
+def drop_expired(df, on=None):
+    """
+    Drop rows whose parsed deadline is before ``on`` (default: today).
+
+    Rows without a parsed deadline are kept. On a frame already sorted by
+    ``sort_by_deadline`` the cut is one binary search.
+
+    Returns the remaining frame and the number of rows dropped.
+    """
+    if df.empty or DATE_COLUMN not in df.columns:
+        return df, 0
+
+    on = today() if on is None else pd.Timestamp(on)
+    dates = df[DATE_COLUMN]
+    known = int(dates.notna().sum())
+
+    if dates.iloc[:known].notna().all() and dates.iloc[:known].is_monotonic_increasing:
+        cut = int(dates.iloc[:known].searchsorted(on))
+        return df.iloc[cut:].reset_index(drop=True), cut
+
+    expired = (dates < on).fillna(False)
+    return df[~expired].reset_index(drop=True), int(expired.sum())
+
+
+def is_open(deadline, source, on=None):
+    """True when ``deadline`` parses to ``on`` (default: today) or later."""
+    date = parse_deadline(deadline, source).date
+    return date is not None and pd.Timestamp(date) >= (today() if on is None else pd.Timestamp(on))
@@ -0,0 +1,230 @@
+import os
+import re
+import zlib
+import random
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+from scrapers.deadlines import CONFIDENCE_COLUMN, DATE_COLUMN
+from scrapers.normalize import MISSING_DESCRIPTIONS
+from scrapers.store import canonical_link
+
+# ======================================================
+# CONFIG
+# ======================================================
+# Estimated Jaccard similarity of Title+Description above which two
+# postings are merged; DEDUP_NEAR=0 keeps only the same-link stage
+THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.7"))
+NEAR_DUPLICATES = os.getenv("DEDUP_NEAR", "1") != "0"
+
+# Candidates must also share this share of title words, so boilerplate
+# descriptions alone never merge two different postings
+TITLE_THRESHOLD = 0.8
+
+NUM_PERM = 64
+BANDS = 16
+SHINGLE_WORDS = 3
+
+# Buckets this large are degenerate (boilerplate text); members are only
+# compared with the first one instead of pairwise
+MAX_BUCKET = 50
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+PLACEHOLDERS = set(MISSING_DESCRIPTIONS) | {"no description available"}
+
+_rng = random.Random(1)
+_MUL = np.array([_rng.getrandbits(64) | 1 for _ in range(NUM_PERM)], dtype=np.uint64)
+_ADD = np.array([_rng.getrandbits(64) for _ in range(NUM_PERM)], dtype=np.uint64)
+
+
+# ======================================================
+# MINHASH
+# ======================================================
+def shingles(text, k=SHINGLE_WORDS):
+    """32-bit hashes of the ``k``-word shingles of ``text``."""
+    tokens = TOKEN_RE.findall(str(text).lower())
+    if not tokens:
+        return set()
+    if len(tokens) <= k:
+        return {zlib.crc32(" ".join(tokens).encode("utf-8"))}
+    return {zlib.crc32(" ".join(tokens[i:i + k]).encode("utf-8")) for i in range(len(tokens) - k + 1)}
+
+
+def signature(hashes):
+    """MinHash signature (multiply-shift hashing, one row per permutation)."""
+    if not hashes:
+        return None
+    x = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+    with np.errstate(over="ignore"):
+        return ((_MUL[:, None] * x[None, :] + _ADD[:, None]) >> np.uint64(32)).min(axis=1)
+
+
+def similarity(a, b):
+    """Jaccard similarity estimated from two signatures."""
+    return float(np.count_nonzero(a == b)) / len(a)
+
+
+def title_similarity(a, b):
+    a, b = set(TOKEN_RE.findall(a.lower())), set(TOKEN_RE.findall(b.lower()))
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def lsh_candidates(signatures, bands=BANDS):
+    """Pairs of row positions sharing at least one band of their signatures."""
+    rows = len(next(s for s in signatures if s is not None)) // bands
+    pairs = set()
+
+    for band in range(bands):
+        buckets = defaultdict(list)
+        for i, sig in enumerate(signatures):
+            if sig is not None:
+                buckets[sig[band * rows:(band + 1) * rows].tobytes()].append(i)
+
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            if len(members) > MAX_BUCKET:
+                pairs.update((members[0], m) for m in members[1:])
+            else:
+                pairs.update((a, b) for n, a in enumerate(members) for b in members[n + 1:])
+
+    return pairs
+
+
+# ======================================================
+# CLUSTERING
+# ======================================================
+class _Clusters:
+    """Union-find over row positions; the root of a cluster is its first row."""
+
+    def __init__(self, n):
+        self.parent = list(range(n))
+
+    def find(self, i):
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, a, b):
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return False
+        self.parent[max(a, b)] = min(a, b)
+        return True
+
+
+def _match_text(df):
+    description = df["Description"].fillna("").astype(str)
+    description = description.where(~description.str.strip().str.lower().isin(PLACEHOLDERS), "")
+    return df["Title"].fillna("").astype(str) + " " + description
+
+
+def _text(value):
+    return "" if value is None or pd.isna(value) else str(value).strip()
+
+
+def _joined(values):
+    seen = []
+    for value in values:
+        for part in _text(value).split(","):
+            part = part.strip()
+            if part and part not in seen:
+                seen.append(part)
+    return ", ".join(seen)
+
+
+def _merge(records):
+    descriptions = [_text(r["Description"]) for r in records]
+    descriptions = [d for d in descriptions if d.lower() not in PLACEHOLDERS]
+
+    # a parsed deadline beats raw text; the columns move together
+    dated = [r for r in records if not pd.isna(r.get(DATE_COLUMN, pd.NaT))]
+    dated = dated or [r for r in records if _text(r["Deadline"])]
+
+    record = dict(records[0])
+    record["Source"] = _joined(r["Source"] for r in records)
+    record["Matched_Vertical"] = _joined(r["Matched_Vertical"] for r in records)
+    if descriptions:
+        record["Description"] = max(descriptions, key=len)
+    if dated:
+        for column in ("Deadline", DATE_COLUMN, CONFIDENCE_COLUMN):
+            if column in record:
+                record[column] = dated[0][column]
+    return record
+
+
+# ======================================================
+# DEDUP STAGE
+# ======================================================
+def dedupe(df, threshold=THRESHOLD, near=NEAR_DUPLICATES):
+    """
+    Merge postings that are the same tender, within or across sources.
+
+    Rows with the same canonical Apply_Link are merged first; the rest are
+    compared with MinHash/LSH over shingled Title+Description, so only
+    candidate pairs are checked and the stage stays sub-quadratic; a pair
+    merges when both the text and the title words are similar enough. Each
+    cluster keeps its first row (``df`` order), lists every source it was
+    found on in ``Source``, and takes the union of verticals, the longest
+    description and the first known deadline (parsed dates first).
+
+    Returns the merged frame and a dict of counts.
+    """
+    stats = {"rows": len(df), "same_link": 0, "near_duplicate": 0, "merged_records": 0}
+    if len(df) < 2:
+        return df, stats
+
+    df = df.reset_index(drop=True)
+    clusters = _Clusters(len(df))
+
+    first_by_link = {}
+    for i, link in enumerate(df["Apply_Link"].map(canonical_link)):
+        if not link:
+            continue
+        if link in first_by_link:
+            stats["same_link"] += clusters.union(first_by_link[link], i)
+        else:
+            first_by_link[link] = i
+
+    if near:
+        signatures = [signature(shingles(text)) for text in _match_text(df)]
+        titles = df["Title"].fillna("").astype(str).tolist()
+        if any(s is not None for s in signatures):
+            for a, b in sorted(lsh_candidates(signatures)):
+                if clusters.find(a) == clusters.find(b):
+                    continue
+                if (similarity(signatures[a], signatures[b]) >= threshold
+                        and title_similarity(titles[a], titles[b]) >= TITLE_THRESHOLD):
+                    stats["near_duplicate"] += clusters.union(a, b)
+
+    roots = pd.Series([clusters.find(i) for i in range(len(df))], index=df.index)
+    duplicated = roots.duplicated(keep=False)
+    if not duplicated.any():
+        return df, stats
+
+    groups = defaultdict(list)
+    for root, record in zip(roots[duplicated], df[duplicated].to_dict("records")):
+        groups[root].append(record)
+    merged = pd.DataFrame.from_dict({root: _merge(records) for root, records in groups.items()},
+                                    orient="index", columns=df.columns)
+    stats["merged_records"] = len(merged)
+
+    df = df[~duplicated | ~roots.duplicated()].copy()
+    df.loc[merged.index, merged.columns] = merged.astype(object)
+    return df.reset_index(drop=True), stats
+
+
+def format_stats(stats):
+    removed = stats.get("same_link", 0) + stats.get("near_duplicate", 0)
+    if not removed:
+        return []
+    return [
+        f"🧬 Merged {removed} duplicate postings into {stats.get('merged_records', 0)} records "
+        f"({stats.get('same_link', 0)} same link, {stats.get('near_duplicate', 0)} near-duplicate)"
+    ]
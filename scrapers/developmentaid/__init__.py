@@ -0,0 +1 @@
+from .developmentaid import scrape_jobs
@@ -1,146 +1,217 @@
 import pandas as pd
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+import os
 import time
-import re
 
-BASE_URL = "https://www.developmentaid.org"
-URL = "https://www.developmentaid.org/tenders/search?locations=147"
-
-KEYWORDS = {
-    "Governance": ["governance","policy","municipal","consulting","consultant","management","public","government","strategy","data"],
-    "Learning": ["education","skill","skills","training","learning","schools","ai"],
-    "Safety": ["gender","safety","health","security","women","child","hygiene"],
-    "Climate": ["climate","environment","energy","green","waste","resilience"]
+from scrapers.browser import measure_page, new_chrome_driver
+from scrapers.classifier import label
+from scrapers.deadlines import DROP_EXPIRED
+from scrapers.developmentaid import developmentaid_api
+from scrapers.driver_pool import DriverPool
+from scrapers.extract import CardSpec, Field
+from scrapers.fetch import Fetcher, new_session, select_text
+from scrapers.pushdown import DEADLINE, DEDUP, KEYWORD, FetchPlan
+from scrapers.readiness import navigate, wait_for_count_stable, wait_for_selector
+from scrapers.registry import Scraper, register
+from scrapers.store import PostingStore
+
+# Override to point at a fixture site (benchmarks/sites.py)
+BASE_URL = os.getenv("DA_BASE_URL", "https://www.developmentaid.org")
+URL = f"{BASE_URL}/tenders/search?locations=147"
+
+# "api" crawls the search API behind the results (developmentaid_api),
+# "browser" reads the cards rendered on the first results page
+MODE = os.getenv("DA_MODE", "api")
+
+# Number of Chrome instances used for detail pages
+POOL_SIZE = int(os.getenv("DA_POOL_SIZE", "4"))
+
+# Pages that may be served over plain HTTP before falling back to Chrome
+FAST_PATH = {
+    "listing": False,  # Angular search results are rendered client-side
+    "detail": True
 }
 
-NORMALIZED = {k: [w.lower() for w in v] for k, v in KEYWORDS.items()}
+DESCRIPTION_SELECTOR = "div.view-excerpt"
 
+CARDS = CardSpec(
+    "da-tender-content-card",
+    title=Field("a.search-card__title", "title"),
+    link=Field("a.search-card__title", "href"),
+    deadline="div.tender-deadline span:nth-of-type(2)"
+)
 
 # ======================================================
 # DRIVER
 # ======================================================
 
-def get_driver():
-    options = Options()
-    options.add_argument("--headless=new")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--window-size=1920,1080")
-    return webdriver.Chrome(options=options)
+def get_driver(capture_network=False):
+    return new_chrome_driver("DevelopmentAid", capture_network=capture_network)
 
 
 # ======================================================
-# CATEGORY DETECTION
+# DESCRIPTION RENDER (POOLED DRIVERS 🔥)
 # ======================================================
 
-def detect_categories(text):
-    text = text.lower()
-    matched = set()
-    for cat, words in NORMALIZED.items():
-        for w in words:
-            if re.search(r"\b" + re.escape(w) + r"\b", text):
-                matched.add(cat)
-                break
-    return ", ".join(matched)
-
-
-# ======================================================
-# DESCRIPTION SCRAPER (SEPARATE DRIVER 🔥)
-# ======================================================
-
-def get_description(link):
-    driver = get_driver()
-    try:
-        driver.get(link)
-
-        WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "div.view-excerpt"))
-        )
-
-        desc = driver.find_element(By.CSS_SELECTOR, "div.view-excerpt").text.strip()
-        return desc
+def render_description(driver, link):
+    navigate(driver, link)
 
-    except:
-        return "No description available"
-
-    finally:
-        driver.quit()
+    if not wait_for_selector(driver, DESCRIPTION_SELECTOR, timeout=15):
+        return None
+    measure_page(driver)
+    return driver.page_source
 
 
 # ======================================================
 # MAIN SCRAPER
 # ======================================================
 
-def scrape_jobs():
-    driver = get_driver()
-    wait = WebDriverWait(driver, 30)
+def listing_browser(driver):
+    """(title, link, deadline) of the cards on the first results page."""
+    navigate(driver, URL)
 
-    rows = []
-    seen_links = set()
+    if not wait_for_count_stable(driver, "da-tender-content-card", timeout=30):
+        raise TimeoutError("no tender cards rendered")
+    measure_page(driver)
 
-    try:
-        driver.get(URL)
+    # 🔥 every card in one script call
+    cards = CARDS.extract(driver)
+    print(f"Total cards found: {len(cards)}")
 
-        wait.until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "da-tender-content-card"))
+    return [
+        (
+            (card["title"] or "").strip(),
+            card["link"] if card["link"].startswith("http") else BASE_URL + card["link"],
+            card["deadline"] or ""
         )
+        for card in cards if card["title"] is not None and card["link"]
+    ]
 
-        time.sleep(3)
 
-        cards = driver.find_elements(By.CSS_SELECTOR, "da-tender-content-card")
-        print(f"Total cards found: {len(cards)}")
+def listing_api(driver):
+    """(title, link, deadline) of every tender on the first DA_MAX_PAGES result pages."""
+    session = new_session(developmentaid_api.PAGE_WORKERS)
+    try:
+        return developmentaid_api.fetch_tenders(session, URL, BASE_URL, driver)
+    finally:
+        session.close()
 
-        for card in cards:
-            try:
-                title_elem = card.find_element(By.CSS_SELECTOR, "a.search-card__title")
-                title = title_elem.get_attribute("title").strip()
 
-                matched_vertical = detect_categories(title)
+def iter_jobs(mode=MODE, pool_size=POOL_SIZE):
+    driver = None
 
-                # ❗ ONLY CATEGORY FILTER (NO DESCRIPTION FILTER)
-                if not matched_vertical:
-                    continue
+    tenders = []
+    plan = FetchPlan("DevelopmentAid", {KEYWORD, DEDUP} | ({DEADLINE} if DROP_EXPIRED else set()))
 
-                href = title_elem.get_attribute("href")
-                link = href if href.startswith("http") else BASE_URL + href
+    try:
+        cards = []
+        if mode == "api":
+            try:
+                # the search request is captured from the page unless DA_API_URL names it
+                if not developmentaid_api.API_URL:
+                    driver = get_driver(capture_network=True)
+                cards = listing_api(driver)
+            except Exception as e:
+                print(f"⚠ DevelopmentAid API listing failed ({e}), falling back to browser")
+
+        if not cards:
+            driver = driver or get_driver()
+            cards = listing_browser(driver)
+
+        # ❗ ONLY CATEGORY FILTER (NO DESCRIPTION FILTER)
+        # 🔽 title keywords, deadline and repeats decide before any detail page
+        for (title, link, deadline), result in plan.plan(cards, lambda card: (card[0], card[2], card[1])):
+            tenders.append({
+                "Source": "DevelopmentAid",
+                "Title": title,
+                "Category": label(result),
+                "Deadline": deadline,
+                "Apply_Link": link
+            })
 
-                if link in seen_links:
-                    continue
-                seen_links.add(link)
+    except Exception as e:
+        print("❌ Error:", str(e))
 
-                # Deadline
-                try:
-                    deadline_elem = card.find_element(
-                        By.CSS_SELECTOR,
-                        "div.tender-deadline span:nth-of-type(2)"
+    finally:
+        if driver is not None:
+            driver.quit()
+
+    plan.report()
+    if not tenders:
+        return
+
+    def row(tender):
+        return {
+            "Source": tender["Source"],
+            "Title": tender["Title"],
+            "Description": tender["Description"],
+            "Category": tender["Category"],
+            "Deadline": tender["Deadline"],
+            "Apply_Link": tender["Apply_Link"]
+        }
+
+    with PostingStore("DevelopmentAid") as store:
+        # 💾 reuse descriptions of tenders seen on earlier runs
+        pending = {}
+        for tender in tenders:
+            known = store.lookup(tender["Apply_Link"])
+            if known and known["Description"]:
+                tender["Description"] = known["Description"]
+                yield row(tender)
+            else:
+                pending[tender["Apply_Link"]] = tender
+
+        # 🔥 descriptions over HTTP first, long-lived drivers only as fallback
+        print(f"🔗 Fetching {len(pending)} descriptions ({pool_size} workers)...")
+        start = time.monotonic()
+
+        with Fetcher("DevelopmentAid", pool_size=pool_size) as fetcher, \
+                DriverPool(get_driver, size=pool_size) as pool:
+            for link, page in fetcher.iter_many(
+                list(pending),
+                DESCRIPTION_SELECTOR,
+                render=lambda link: pool.run(render_description, link),
+                fast=FAST_PATH["detail"]
+            ):
+                tender = pending[link]
+                tender["Description"] = select_text(page, DESCRIPTION_SELECTOR) or "No description available"
+
+                if page is not None:
+                    store.save(
+                        link,
+                        Title=tender["Title"],
+                        Description=tender["Description"],
+                        Deadline=tender["Deadline"],
+                        Matched_Vertical=tender["Category"]
                     )
-                    deadline = deadline_elem.text.strip()
-                except:
-                    deadline = ""
 
-                print(f"🔗 Scraping: {title}")
+                yield row(tender)
 
-                # 🔥 description without breaking main driver
-                description = get_description(link)
+            recycled = pool.recycled
+            fetcher.report()
 
-                rows.append({
-                    "Source": "DevelopmentAid",
-                    "Title": title,
-                    "Description": description,
-                    "Category": matched_vertical,
-                    "Deadline": deadline,
-                    "Apply_Link": link
-                })
+        store.report()
 
-            except Exception:
-                continue
+    elapsed = time.monotonic() - start
+    rate = len(pending) / elapsed * 60 if elapsed else 0.0
+    print(
+        f"📈 DevelopmentAid details: {len(pending)} tenders in {elapsed:.1f}s "
+        f"({rate:.1f} tenders/min, {recycled} drivers recycled)"
+    )
 
-    except Exception as e:
-        print("❌ Error:", str(e))
 
-    driver.quit()
-    return pd.DataFrame(rows)
+def scrape_jobs(mode=MODE, pool_size=POOL_SIZE):
+    return pd.DataFrame(list(iter_jobs(mode, pool_size)))
+
+
+# ======================================================
+# PLUGIN
+# ======================================================
+@register
+class DevelopmentAidScraper(Scraper):
+    name = "DevelopmentAid"
+    order = 40
+    time_budget = 14 * 60
+    column_map = {"Category": "Matched_Vertical"}
+
+    def records(self):
+        return iter_jobs()
@@ -0,0 +1,219 @@
+import os
+import copy
+import json
+import math
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urljoin
+
+from scrapers.browser import captured_json
+from scrapers.checkpoint import CrawlCheckpoint
+from scrapers.jsonapi import (
+    PAGE_PARAMS, deadline_text, find_records, find_total, first_value, get_json, query_params, with_params
+)
+from scrapers.readiness import navigate, wait_for_count_stable
+
+# ======================================================
+# CONFIG
+# ======================================================
+# Direct search endpoint (GET, with a page parameter). Left empty, the
+# request is captured from the calls the search page itself makes.
+API_URL = os.getenv("DA_API_URL", "")
+
+# Result pages read per run, and how many are requested at a time
+MAX_PAGES = int(os.getenv("DA_MAX_PAGES", "10"))
+PAGE_WORKERS = int(os.getenv("DA_PAGE_WORKERS", "4"))
+
+# Where a tender's fields may be in the JSON; the first non-empty key wins
+TITLE_KEYS = ("title", "name")
+DEADLINE_KEYS = ("deadline", "deadlineDate", "deadline_date", "closingDate", "submissionDeadline", "expirationDate")
+LINK_KEYS = ("url", "link", "permalink")
+ID_KEYS = ("id", "tenderId")
+SLUG_KEYS = ("slug", "seoUrl")
+
+# A search request as the Angular app makes it; page n of the results is
+# ``first_page + n - 1`` in ``page_param`` (query string or JSON body)
+SearchRequest = namedtuple("SearchRequest", ["url", "method", "body", "page_param", "first_page"])
+
+
+# ======================================================
+# SEARCH REQUESTS
+# ======================================================
+def _find_key(body, keys):
+    """(dict, key) of the first of ``keys`` in ``body`` or its nested dicts."""
+    stack = [body]
+    while stack:
+        node = stack.pop(0)
+        for key in keys:
+            if key in node:
+                return node, key
+        stack.extend(v for v in node.values() if isinstance(v, dict))
+    return None, None
+
+
+def search_request(url, method="GET", post_data=None):
+    body = json.loads(post_data) if post_data else None
+
+    if isinstance(body, dict):
+        node, page_param = _find_key(body, PAGE_PARAMS)
+        value = node[page_param] if node else None
+    else:
+        query = query_params(url)
+        page_param = next((p for p in PAGE_PARAMS if p in query), None)
+        value = query.get(page_param)
+
+    first_page = int(value) if str(value).isdigit() else 1
+    return SearchRequest(url, method, body, page_param, first_page)
+
+
+def page_request(search, n):
+    """(url, body) that ask for page ``n`` (1-based) of ``search``."""
+    if search.page_param is None:
+        return search.url, search.body
+
+    value = search.first_page + n - 1
+    if search.body is None:
+        return with_params(search.url, **{search.page_param: value}), None
+
+    body = copy.deepcopy(search.body)
+    node, key = _find_key(body, (search.page_param,))
+    node[key] = value
+    return search.url, body
+
+
+def search_key(search):
+    """Identifies the search across runs, whatever page it is on."""
+    url, body = page_request(search, 1)
+    return " ".join((search.method, url, json.dumps(body, sort_keys=True) if body else ""))
+
+
+def capture_search(driver, url, session):
+    """
+    Load the search page, return the SearchRequest behind its results and
+    the response to it, and hand the page's cookies to ``session``.
+    """
+    navigate(driver, url)
+    wait_for_count_stable(driver, "da-tender-content-card", timeout=30)
+
+    captured = [(len(find_records(c.payload, TITLE_KEYS)), c) for c in captured_json(driver)]
+    captured = [(n, c) for n, c in captured if n]
+    if not captured:
+        raise LookupError(f"no tender list among the JSON responses of {url}")
+
+    for cookie in driver.get_cookies():
+        session.cookies.set(cookie["name"], cookie["value"], domain=cookie.get("domain"))
+
+    _, response = max(captured, key=lambda nc: nc[0])
+    return search_request(response.url, response.method, response.post_data), response.payload
+
+
+# ======================================================
+# JSON → SCHEMA
+# ======================================================
+def tender_link(item, base_url):
+    link = first_value(item, LINK_KEYS)
+    if isinstance(link, str):
+        return urljoin(base_url + "/", link)
+
+    # the site's own links are /tenders/view/<id>/<slug>
+    tender_id = first_value(item, ID_KEYS)
+    if tender_id is None:
+        return ""
+    slug = first_value(item, SLUG_KEYS)
+    return f"{base_url}/tenders/view/{tender_id}" + (f"/{slug}" if slug else "")
+
+
+def map_tender(item, base_url):
+    """A search result as the (title, link, deadline) card the scraper plans on."""
+    return (
+        str(first_value(item, TITLE_KEYS) or "").strip(),
+        tender_link(item, base_url),
+        deadline_text(first_value(item, DEADLINE_KEYS), "developmentaid")
+    )
+
+
+# ======================================================
+# CRAWL
+# ======================================================
+def fetch_page(session, search, n):
+    url, body = page_request(search, n)
+    return find_records(get_json(session, url, search.method, body), TITLE_KEYS)
+
+
+def crawl(session, search, first=None, checkpoint=None, max_pages=MAX_PAGES, workers=PAGE_WORKERS):
+    """
+    Result items of pages 1..``max_pages`` of ``search``, in page order.
+
+    Pages are requested ``workers`` at a time, in waves that stop at the
+    first empty page; when the first response reports a total, every page
+    up to it is queued at once. Each page is checkpointed as it completes,
+    so a crawl cut short resumes after its last completed page; a crawl
+    that reaches its end clears the checkpoint. ``first`` is an already
+    captured response for page 1.
+    """
+    pages = checkpoint.resume() if checkpoint else {}
+    last = max_pages if search.page_param else 1
+    wave_size = workers
+
+    if 1 not in pages:
+        payload = first
+        if payload is None:
+            url, body = page_request(search, 1)
+            payload = get_json(session, url, search.method, body)
+        pages[1] = find_records(payload, TITLE_KEYS)
+        if checkpoint:
+            checkpoint.complete(1, pages[1])
+
+        total = find_total(payload)
+        if total is not None and pages[1]:
+            last = min(last, math.ceil(total / len(pages[1])))
+            wave_size = max(1, last - 1)
+
+    failed, exhausted = 0, not pages[1]
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        n = 2
+        while n <= last and not exhausted:
+            wave = [p for p in range(n, min(n + wave_size, last + 1)) if p not in pages]
+            futures = {executor.submit(fetch_page, session, search, p): p for p in wave}
+
+            for future in as_completed(futures):
+                p = futures[future]
+                try:
+                    pages[p] = future.result()
+                except Exception as e:
+                    print(f"⚠ DevelopmentAid page {p} failed: {e}")
+                    failed += 1
+                    continue
+
+                if checkpoint:
+                    checkpoint.complete(p, pages[p])
+                exhausted = exhausted or not pages[p]
+
+            n += wave_size
+
+    if checkpoint:
+        checkpoint.report()
+        if not failed:
+            checkpoint.finish()
+
+    return [item for p in sorted(pages) for item in pages[p]]
+
+
+def fetch_tenders(session, url, base_url, driver=None):
+    """
+    (title, link, deadline) of every tender the search at ``url`` lists,
+    up to MAX_PAGES, from API_URL or from the request the page was seen
+    making (``driver`` started with ``capture_network``).
+    """
+    if API_URL:
+        search, first = search_request(API_URL), None
+    else:
+        search, first = capture_search(driver, url, session)
+
+    with CrawlCheckpoint("DevelopmentAid", search_key(search)) as checkpoint:
+        items = crawl(session, search, first, checkpoint)
+
+    cards = [map_tender(item, base_url) for item in items]
+    cards = [card for card in cards if card[0] and card[1]]
+    print(f"✅ Found {len(cards)} DevelopmentAid tenders via API")
+    return cards
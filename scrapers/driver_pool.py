@@ -0,0 +1,137 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+
+# ======================================================
+# DRIVER POOL
+# ======================================================
+
+class DriverPool:
+    """
+    Bounded pool of long-lived WebDriver instances.
+
+    Drivers are started lazily (at most ``size`` of them) and handed out to
+    worker threads one at a time. A task that raises leaves its driver
+    treated as crashed: it is quit, its slot is freed for a replacement and
+    the task is retried once on a fresh driver.
+    """
+
+    def __init__(self, factory, size=4):
+        self.factory = factory
+        self.size = max(1, int(size))
+        self.recycled = 0
+
+        self._idle = queue.Queue()
+        self._all = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    # --------------------------------------------------
+    # checkout / checkin
+    # --------------------------------------------------
+
+    def _acquire(self):
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+
+            with self._lock:
+                can_create = len(self._all) < self.size
+                if can_create:
+                    # reserve the slot before the (slow) Chrome start
+                    self._all.append(None)
+
+            if can_create:
+                break
+
+            # re-check periodically: a crashed driver frees its slot
+            try:
+                return self._idle.get(timeout=0.5)
+            except queue.Empty:
+                pass
+
+        try:
+            driver = self.factory()
+        except Exception:
+            with self._lock:
+                self._all.remove(None)
+            raise
+
+        with self._lock:
+            self._all[self._all.index(None)] = driver
+        return driver
+
+    def _release(self, driver, broken=False):
+        if not broken and not self._closed:
+            self._idle.put(driver)
+            return
+
+        with self._lock:
+            if driver in self._all:
+                self._all.remove(driver)
+            if broken:
+                self.recycled += 1
+
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    # --------------------------------------------------
+    # task execution
+    # --------------------------------------------------
+
+    def run(self, fn, *args, retries=1):
+        for attempt in range(retries + 1):
+            driver = self._acquire()
+            broken = True
+            try:
+                result = fn(driver, *args)
+                broken = False
+                return result
+            except Exception:
+                # a dead chromedriver surfaces as WebDriverException or as
+                # urllib3 / socket errors; either way the driver is replaced
+                if attempt == retries:
+                    raise
+            finally:
+                self._release(driver, broken=broken)
+
+    def imap(self, fn, items, default=None):
+        """
+        Run ``fn(driver, item)`` for every item in parallel, yielding
+        ``(item, result)`` as soon as each one finishes (``default`` on failure).
+        """
+
+        def task(item):
+            try:
+                return self.run(fn, item)
+            except Exception:
+                return default
+
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            futures = {executor.submit(task, item): item for item in items}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+    def close(self):
+        self._closed = True
+
+        with self._lock:
+            drivers = [d for d in self._all if d is not None]
+            self._all = []
+
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1 +1,2 @@
 # ESTM scraper package
+from .estm import scrape_jobs
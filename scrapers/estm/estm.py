@@ -1,11 +1,16 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import NoSuchElementException
 import pandas as pd
 import os
-import time
+
+from scrapers.browser import measure_page, new_chrome_driver
+from scrapers.driver_pool import DriverPool
+from scrapers.estm.estm_api import iter_jobs_api
+from scrapers.extract import CardSpec, Field
+from scrapers.pushdown import DEDUP, FetchPlan
+from scrapers.readiness import navigate, wait_for_count_stable, wait_for_selector
+from scrapers.registry import Scraper, register
+from scrapers.store import PostingStore
 
 # ======================================================
 # PATH SETUP
@@ -15,107 +20,158 @@ PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, "..", ".."))
 OUTPUT_DIR = os.path.join(PROJECT_ROOT, "output")
 OUTPUT_FILE = os.path.join(OUTPUT_DIR, "estm_jobs.xlsx")
 
-URL = (
+# Override to point at a fixture site (benchmarks/sites.py)
+URL = os.getenv("ESTM_URL", (
     "https://estm.fa.em2.oraclecloud.com/hcmUI/CandidateExperience/en/sites/CX_1/jobs"
     "?location=India&locationId=300000000440677&locationLevel=country&mode=location"
+))
+
+# Number of Chrome instances used for "Apply Before" detail pages
+POOL_SIZE = int(os.getenv("ESTM_POOL_SIZE", "3"))
+
+# "api" reads the Candidate Experience JSON endpoints, "browser" drives Chrome
+MODE = os.getenv("ESTM_MODE", "api")
+
+# The job link is an <a> just before the card's "job-grid-item__link" wrapper
+CARDS = CardSpec(
+    "div.job-grid-item__content",
+    title="span.job-tile__title",
+    location="span[data-bind*='primaryLocation']",
+    link=Field("a", "href", closest="div.job-grid-item__link", preceding=True)
 )
 
 # ======================================================
-# SAFE TEXT FUNCTION
+# DRIVER
 # ======================================================
-def safe_text(parent, by, value):
-    try:
-        return parent.find_element(by, value).text.strip()
-    except:
-        return ""
+def get_driver():
+    return new_chrome_driver("ESTM")
 
 # ======================================================
-# DRIVER
+# LISTING PHASE
 # ======================================================
-def get_driver():
-    options = Options()
-    options.add_argument("--headless=new")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--window-size=1920,1080")
-    return webdriver.Chrome(options=options)
+def scrape_listing(driver):
+    navigate(driver, URL)
+
+    wait_for_count_stable(driver, "div.job-grid-item__content", timeout=30)
+    measure_page(driver)
+
+    # 🔥 every card in one script call
+    cards = CARDS.extract(driver)
+    print(f"✅ Found {len(cards)} ESTM jobs")
+
+    listing = []
+
+    for card in cards:
+        if card["title"] or card["link"]:
+            listing.append({
+                "Title": card["title"] or "",
+                "Location": card["location"] or "",
+                "Apply_Link": card["link"] or ""
+            })
+
+    return listing
 
 # ======================================================
-# SCRAPER
+# DETAIL PHASE
 # ======================================================
-def scrape_jobs():
-    driver = get_driver()
-    wait = WebDriverWait(driver, 30)
+def get_apply_before(driver, link):
+    """The job's "Apply Before" text, or None when the page did not show it (not stored, retried next run)."""
+    navigate(driver, link)
 
-    driver.get(URL)
+    try:
+        if not wait_for_selector(driver, "div.job-details__info-section", timeout=30):
+            return None
+        measure_page(driver)
 
-    wait.until(
-        EC.presence_of_element_located(
-            (By.CSS_SELECTOR, "div.job-grid-item__content")
-        )
-    )
+        return driver.find_element(
+            By.XPATH,
+            "//span[text()='Apply Before']/following-sibling::span"
+        ).text.strip() or None
 
-    time.sleep(3)
+    except NoSuchElementException:
+        return None
 
-    cards = driver.find_elements(By.CSS_SELECTOR, "div.job-grid-item__content")
-    print(f"✅ Found {len(cards)} ESTM jobs")
+# ======================================================
+# SCRAPER (BROWSER)
+# ======================================================
+def iter_jobs_browser(pool_size=POOL_SIZE):
+    driver = get_driver()
 
-    jobs = []
+    try:
+        # 🔥 Listing loads exactly once
+        listing = scrape_listing(driver)
+    finally:
+        driver.quit()
+
+    def job(entry, deadline):
+        return {
+            "Source": "ESTM",
+            "Title": entry["Title"],
+            "Location": entry["Location"],
+            "Deadline": deadline,
+            "Apply_Link": entry["Apply_Link"]
+        }
+
+    # 🔽 the deadline is only on the detail page and every job is kept
+    # whatever its title, so repeats are all that can be skipped
+    plan = FetchPlan("ESTM", {DEDUP})
+    listing = [entry for entry, _ in plan.plan(listing, lambda e: (e["Title"], "", e["Apply_Link"]))]
+    plan.report()
+
+    entries = {}
+    with PostingStore("ESTM") as store:
+        # 💾 "Apply Before" of jobs seen on earlier runs comes from the store
+        for entry in listing:
+            link = entry["Apply_Link"]
+            if not link:
+                yield job(entry, "")
+                continue
+
+            known = store.lookup(link)
+            if known is not None:
+                yield job(entry, known["Deadline"] or "")
+            else:
+                entries.setdefault(link, []).append(entry)
+
+        if entries:
+            print(f"🔗 Fetching {len(entries)} ESTM detail pages with {pool_size} drivers...")
+            with DriverPool(get_driver, size=pool_size) as pool:
+                for link, deadline in pool.imap(get_apply_before, list(entries), default=None):
+                    # a missing deadline is not cached, so the page is retried next run
+                    if deadline:
+                        store.save(link, Title=entries[link][0]["Title"], Deadline=deadline)
+
+                    for entry in entries[link]:
+                        yield job(entry, deadline or "")
+
+        store.report()
 
-    for card in cards:
-        title = safe_text(card, By.CSS_SELECTOR, "span.job-tile__title")
-        location = safe_text(card, By.CSS_SELECTOR, "span[data-bind*='primaryLocation']")
 
+# ======================================================
+# SCRAPER
+# ======================================================
+def iter_jobs(mode=MODE, pool_size=POOL_SIZE):
+    if mode == "api":
+        yielded = 0
         try:
-            apply_link = card.find_element(
-                By.XPATH,
-                "ancestor::div[contains(@class,'job-grid-item__link')]/preceding-sibling::a"
-            ).get_attribute("href")
-        except:
-            apply_link = ""
-
-        deadline = ""
-
-        # 🔥 Visit detail page to get Apply Before
-        if apply_link:
-            driver.get(apply_link)
-
-            try:
-                wait.until(
-                    EC.presence_of_element_located(
-                        (By.CSS_SELECTOR, "div.job-details__info-section")
-                    )
-                )
-
-                deadline = driver.find_element(
-                    By.XPATH,
-                    "//span[text()='Apply Before']/following-sibling::span"
-                ).text.strip()
-
-            except:
-                deadline = ""
-
-            # Go back to listing page
-            driver.get(URL)
-            wait.until(
-                EC.presence_of_element_located(
-                    (By.CSS_SELECTOR, "div.job-grid-item__content")
-                )
-            )
-            cards = driver.find_elements(By.CSS_SELECTOR, "div.job-grid-item__content")
-
-        if title or apply_link:
-            jobs.append({
-                "Source": "ESTM",
-                "Title": title,
-                "Location": location,
-                "Deadline": deadline,
-                "Apply_Link": apply_link
-            })
+            for job in iter_jobs_api():
+                yielded += 1
+                yield job
+        except Exception as e:
+            # rows already handed on stay valid; only fall back when none were
+            if yielded:
+                raise
+            print(f"⚠ ESTM API failed ({e}), falling back to browser")
+        else:
+            if yielded:
+                return
+            print("⚠ ESTM API returned no jobs, falling back to browser")
+
+    yield from iter_jobs_browser(pool_size)
 
-    driver.quit()
-    return pd.DataFrame(jobs)
+
+def scrape_jobs(mode=MODE, pool_size=POOL_SIZE):
+    return pd.DataFrame(list(iter_jobs(mode, pool_size)))
 
 # ======================================================
 # SAVE TO EXCEL
@@ -139,6 +195,19 @@ def save_to_excel(df):
     df.to_excel(OUTPUT_FILE, index=False, engine="openpyxl")
     print(f"✅ ESTM Excel created: {OUTPUT_FILE}")
 
+# ======================================================
+# PLUGIN
+# ======================================================
+@register
+class ESTMScraper(Scraper):
+    name = "ESTM"
+    order = 10
+    time_budget = 8 * 60
+
+    def records(self):
+        return iter_jobs()
+
+
 # ======================================================
 # MAIN
 # ======================================================
@@ -0,0 +1,178 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import quote
+
+from scrapers.deadlines import DROP_EXPIRED
+from scrapers.fetch import new_session, parse_html
+from scrapers.jsonapi import deadline_text, get_json
+from scrapers.pushdown import DEADLINE, FetchPlan
+from scrapers.store import PostingStore
+
+# ======================================================
+# CONFIG
+# ======================================================
+# Point at a stub server (scrapers/estm/stub_server.py) for offline runs
+API_HOST = os.getenv("ESTM_API_HOST", "https://estm.fa.em2.oraclecloud.com")
+
+SITE_NUMBER = "CX_1"
+LOCATION_ID = "300000000440677"
+PAGE_SIZE = 25
+WORKERS = int(os.getenv("ESTM_API_WORKERS", "6"))
+TIMEOUT = 30
+
+REQUISITIONS_PATH = "/hcmRestApi/resources/latest/recruitingCEJobRequisitions"
+DETAILS_PATH = "/hcmRestApi/resources/latest/recruitingCEJobRequisitionDetails"
+JOB_PATH = "/hcmUI/CandidateExperience/en/sites/{site}/job/{id}"
+
+
+# ======================================================
+# URL BUILDERS
+# ======================================================
+def requisitions_url(offset, host=API_HOST):
+    finder = (
+        f"findReqs;siteNumber={SITE_NUMBER},locationId={LOCATION_ID},"
+        f"limit={PAGE_SIZE},offset={offset},sortBy=POSTING_DATES_DESC"
+    )
+    return (
+        f"{host}{REQUISITIONS_PATH}?onlyData=true"
+        f"&expand=requisitionList.secondaryLocations&finder={quote(finder, safe=';,=')}"
+    )
+
+
+def details_url(req_id, host=API_HOST):
+    finder = f'ById;Id="{req_id}",siteNumber={SITE_NUMBER}'
+    return f"{host}{DETAILS_PATH}?expand=all&onlyData=true&finder={quote(finder, safe=';,=')}"
+
+
+def job_url(req_id, host=API_HOST):
+    return host + JOB_PATH.format(site=SITE_NUMBER, id=req_id)
+
+
+# ======================================================
+# JSON → SCHEMA
+# ======================================================
+def html_to_text(html):
+    if not html:
+        return ""
+    return parse_html(html).get_text(" ", strip=True)
+
+
+def map_requisition(req, detail=None, host=API_HOST):
+    detail = detail or {}
+
+    description = " ".join(
+        part for part in (
+            html_to_text(detail.get("ExternalDescriptionStr") or req.get("ShortDescriptionStr")),
+            html_to_text(detail.get("ExternalResponsibilitiesStr")),
+            html_to_text(detail.get("ExternalQualificationsStr")),
+        ) if part
+    )
+
+    # "Apply Before" on the job page is ExternalPostedEndDate; a timestamp
+    # becomes its date in DEADLINE_TZ, not the UTC date it is written in
+    deadline = deadline_text(detail.get("ExternalPostedEndDate") or req.get("PostingEndDate"), "estm")
+
+    return {
+        "Source": "ESTM",
+        "Title": (req.get("Title") or detail.get("Title") or "").strip(),
+        "Location": req.get("PrimaryLocation") or detail.get("PrimaryLocation") or "",
+        "Description": description,
+        "Deadline": deadline,
+        "Apply_Link": job_url(req.get("Id"), host)
+    }
+
+
+# ======================================================
+# FETCHING
+# ======================================================
+def _search_page(session, offset, host):
+    items = get_json(session, requisitions_url(offset, host), timeout=TIMEOUT).get("items") or [{}]
+    return items[0]
+
+
+def _detail(session, req_id, host):
+    try:
+        items = get_json(session, details_url(req_id, host), timeout=TIMEOUT).get("items") or [{}]
+        return items[0]
+    except Exception as e:
+        print(f"⚠ ESTM detail {req_id} failed: {e}")
+        return {}
+
+
+def fetch_requisitions(session, host=API_HOST, workers=WORKERS):
+    first = _search_page(session, 0, host)
+    requisitions = list(first.get("requisitionList") or [])
+    total = int(first.get("TotalJobsCount") or len(requisitions))
+
+    offsets = range(PAGE_SIZE, total, PAGE_SIZE)
+    if offsets:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for page in executor.map(lambda o: _search_page(session, o, host), offsets):
+                requisitions.extend(page.get("requisitionList") or [])
+
+    # pages can shift while we read them; keep the first copy of each Id
+    unique = {}
+    for req in requisitions:
+        if req.get("Id") is not None:
+            unique.setdefault(str(req["Id"]), req)
+
+    print(f"✅ Found {len(unique)} ESTM jobs via API (reported total {total})")
+    return list(unique.values())
+
+
+# ======================================================
+# SCRAPER
+# ======================================================
+def iter_jobs_api(host=API_HOST, workers=WORKERS):
+    """Yield ESTM jobs: known ones straight from the store, new ones as details arrive."""
+    session = new_session(workers)
+
+    try:
+        with PostingStore("ESTM") as store:
+            requisitions = fetch_requisitions(session, host, workers)
+
+            # 🔽 requisitions whose listed end date has passed need no details
+            if DROP_EXPIRED:
+                plan = FetchPlan("ESTM", {DEADLINE})
+                requisitions = [
+                    req for req, _ in plan.plan(
+                        requisitions, lambda req: (req.get("Title"), req.get("PostingEndDate"), None)
+                    )
+                ]
+                plan.report()
+
+            # 💾 only fetch details for requisitions not seen on earlier runs
+            pending = []
+            for req in requisitions:
+                known = store.lookup(job_url(req["Id"], host))
+                if known is None:
+                    pending.append(req)
+                    continue
+
+                job = map_requisition(req, host=host)
+                job["Description"] = known["Description"] or job["Description"]
+                job["Deadline"] = known["Deadline"] or job["Deadline"]
+                yield job
+
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    executor.submit(_detail, session, req["Id"], host): req for req in pending
+                }
+                for future in as_completed(futures):
+                    detail = future.result()
+                    job = map_requisition(futures[future], detail, host)
+
+                    if detail:
+                        store.save(
+                            job["Apply_Link"],
+                            Title=job["Title"],
+                            Description=job["Description"],
+                            Deadline=job["Deadline"]
+                        )
+
+                    yield job
+
+            store.report()
+
+    finally:
+        session.close()
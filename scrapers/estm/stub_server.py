@@ -0,0 +1,112 @@
+import os
+import re
+import json
+import argparse
+import threading
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from scrapers.estm.estm_api import DETAILS_PATH, REQUISITIONS_PATH
+
+# ======================================================
+# FIXTURES
+# ======================================================
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# The day the fixtures read as recorded on; their dates are served shifted
+# by the days since, so postings stay open instead of expiring with time
+RECORDED_ON = date(2026, 1, 1)
+
+DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}")
+
+
+def shift_dates(node, days):
+    """``node`` with the date of every ISO date(time) string moved by ``days``."""
+    if isinstance(node, dict):
+        return {k: shift_dates(v, days) for k, v in node.items()}
+    if isinstance(node, list):
+        return [shift_dates(v, days) for v in node]
+    if isinstance(node, str) and DATE_RE.match(node):
+        shifted = date.fromisoformat(node[:10]) + timedelta(days=days)
+        return shifted.isoformat() + node[10:]
+    return node
+
+
+def load_fixtures(fixtures_dir=FIXTURES_DIR, today=None):
+    with open(os.path.join(fixtures_dir, "requisitions.json"), encoding="utf-8") as f:
+        requisitions = json.load(f)
+    with open(os.path.join(fixtures_dir, "details.json"), encoding="utf-8") as f:
+        details = json.load(f)
+
+    days = ((today or date.today()) - RECORDED_ON).days
+    return shift_dates(requisitions, days), shift_dates(details, days)
+
+
+def _finder_value(finder, key):
+    match = re.search(rf"[;,]{key}=([^,;]*)", finder)
+    return match.group(1).strip('"') if match else None
+
+
+# ======================================================
+# HANDLER
+# ======================================================
+def make_handler(requisitions, details):
+    listing = requisitions["items"][0]["requisitionList"]
+
+    class StubHandler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _send_json(self, payload, status=200):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            finder = parse_qs(url.query).get("finder", [""])[0]
+
+            if url.path == REQUISITIONS_PATH:
+                offset = int(_finder_value(finder, "offset") or 0)
+                limit = int(_finder_value(finder, "limit") or 25)
+                self._send_json({"items": [{
+                    "TotalJobsCount": len(listing),
+                    "requisitionList": listing[offset:offset + limit]
+                }]})
+
+            elif url.path == DETAILS_PATH:
+                detail = details.get(_finder_value(finder, "Id") or "")
+                self._send_json({"items": [detail] if detail else []})
+
+            else:
+                self._send_json({"error": "not found"}, status=404)
+
+    return StubHandler
+
+
+# ======================================================
+# SERVER
+# ======================================================
+def start_stub_server(port=0, fixtures_dir=FIXTURES_DIR):
+    """Serve the recorded ESTM JSON in a background thread; returns (server, host)."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(*load_fixtures(fixtures_dir)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve recorded ESTM API responses")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    server, host = start_stub_server(args.port)
+    print(f"🧪 ESTM stub API on {host} (set ESTM_API_HOST={host})")
+
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
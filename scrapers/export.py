@@ -0,0 +1,275 @@
+import os
+import json
+import traceback
+from copy import copy
+from datetime import datetime, timezone
+
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, Side
+
+from scrapers.timing import span
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# ======================================================
+# CONFIG
+# ======================================================
+# "stream" writes and formats in one write-only pass; "pandas" is the old
+# to_excel + load_workbook formatting pass (kept for comparison)
+EXCEL_WRITER = os.getenv("EXCEL_WRITER", "stream")
+
+# Bump when FINAL_COLUMNS or their meaning change
+SCHEMA_VERSION = 2
+
+# Low-cardinality columns stored as dictionaries in Parquet
+CATEGORICAL_COLUMNS = ("Source", "Matched_Vertical")
+
+SHEET_NAME = "Sheet1"
+
+COLUMN_WIDTHS = {
+    "A": 20,
+    "B": 55,
+    "C": 120,
+    "D": 35,
+    "E": 25,
+    "F": 60,
+    "G": 14,
+    "H": 12,
+}
+
+ROW_HEIGHT = 95
+HEADER_HEIGHT = 15
+
+LINK_COLUMN = "Apply_Link"
+
+# Rows converted to Python values at a time
+CHUNK_ROWS = 5000
+
+# Excel refuses to open sheets with more hyperlinks than this
+MAX_HYPERLINKS = 65530
+
+CELL_ALIGNMENT = Alignment(wrap_text=True, vertical="top")
+
+# Same look as the pandas header row
+HEADER_FONT = Font(bold=True)
+HEADER_BORDER = Border(*(Side(style="thin"),) * 4)
+HEADER_ALIGNMENT = Alignment(horizontal="center", vertical="top")
+
+DATE_FORMAT = "yyyy-mm-dd"
+
+
+# ======================================================
+# STREAMING WRITER
+# ======================================================
+def _styled(ws, **style):
+    """Style array of a cell with ``style``, to copy onto many cells cheaply."""
+    cell = WriteOnlyCell(ws)
+    for name, spec in style.items():
+        setattr(cell, name, spec)
+    return cell._style
+
+
+def _cell(ws, value, style):
+    cell = WriteOnlyCell(ws, value=value)
+    cell._style = copy(style)
+    return cell
+
+
+def write_excel_stream(df, path):
+    """
+    Write ``df`` to ``path`` with the Combined.xlsx layout in one pass.
+
+    Uses openpyxl's write-only workbook, so rows go straight to disk and
+    memory stays flat. Row height comes from the sheet default instead of
+    one entry per row; the first MAX_HYPERLINKS links become hyperlinks.
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(SHEET_NAME)
+
+    for column, width in COLUMN_WIDTHS.items():
+        ws.column_dimensions[column].width = width
+
+    ws.sheet_format.defaultRowHeight = ROW_HEIGHT
+    ws.sheet_format.customHeight = True
+    ws.row_dimensions[1].height = HEADER_HEIGHT
+
+    header_style = _styled(ws, font=HEADER_FONT, border=HEADER_BORDER, alignment=HEADER_ALIGNMENT)
+    body_style = _styled(ws, alignment=CELL_ALIGNMENT)
+    date_style = _styled(ws, alignment=CELL_ALIGNMENT, number_format=DATE_FORMAT)
+    styles = [
+        date_style if str(dtype).startswith("datetime64") else body_style
+        for dtype in df.dtypes
+    ]
+
+    ws.append([_cell(ws, str(name), header_style) for name in df.columns])
+
+    link_index = df.columns.get_loc(LINK_COLUMN) if LINK_COLUMN in df.columns else None
+    links = 0
+
+    for start in range(0, len(df), CHUNK_ROWS):
+        chunk = df.iloc[start:start + CHUNK_ROWS]
+        # NaN/NA become empty cells, like pandas.to_excel
+        chunk = chunk.astype(object).where(chunk.notna(), None)
+
+        for record in chunk.itertuples(index=False, name=None):
+            row = [_cell(ws, value, style) for value, style in zip(record, styles)]
+
+            if link_index is not None and links < MAX_HYPERLINKS:
+                link = row[link_index].value
+                if isinstance(link, str) and link.startswith(("http://", "https://")):
+                    row[link_index].hyperlink = link
+                    links += 1
+
+            ws.append(row)
+
+    wb.save(path)
+    print(f"✅ Excel written and formatted in one pass ({links} hyperlinks)")
+
+
+# ======================================================
+# PANDAS WRITER (TWO PASSES)
+# ======================================================
+def format_excel(path):
+    try:
+        wb = load_workbook(path)
+        ws = wb.active
+
+        for column, width in COLUMN_WIDTHS.items():
+            ws.column_dimensions[column].width = width
+
+        for row in ws.iter_rows(min_row=2):
+            ws.row_dimensions[row[0].row].height = ROW_HEIGHT
+            for cell in row:
+                cell.alignment = CELL_ALIGNMENT
+
+        wb.save(path)
+        print("✅ Excel formatting applied")
+
+    except Exception:
+        print("❌ Excel formatting failed")
+        traceback.print_exc()
+
+
+def write_excel_pandas(df, path):
+    df.to_excel(path, index=False, engine="openpyxl")
+    format_excel(path)
+
+
+# ======================================================
+# ENTRY POINT
+# ======================================================
+WRITERS = {
+    "stream": write_excel_stream,
+    "pandas": write_excel_pandas,
+}
+
+
+def write_excel(df, path, mode=None):
+    mode = mode or EXCEL_WRITER
+    if mode not in WRITERS:
+        raise ValueError(f"Unknown EXCEL_WRITER {mode!r}, expected one of {sorted(WRITERS)}")
+    WRITERS[mode](df, path)
+
+
+# ======================================================
+# DATASET FILES (PARQUET / JSONL / MANIFEST)
+# ======================================================
+def _replace_atomically(path, write):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def write_parquet(df, path):
+    """Columnar copy of the dataset; returns False when pyarrow is missing."""
+    if not HAS_PYARROW:
+        print("⚠ pyarrow not installed, skipping Parquet output")
+        return False
+
+    table = df.astype({c: "category" for c in CATEGORICAL_COLUMNS if c in df.columns})
+    _replace_atomically(path, lambda tmp: table.to_parquet(tmp, index=False, engine="pyarrow"))
+    return True
+
+
+def write_jsonl(df, path):
+    """One JSON object per line, in output order (unescaped, so diffs stay readable)."""
+    def dump(tmp):
+        with open(tmp, "w", encoding="utf-8") as fh:
+            for start in range(0, len(df), CHUNK_ROWS):
+                chunk = df.iloc[start:start + CHUNK_ROWS]
+                # datetime columns hold calendar dates (Deadline_Date)
+                dates = [c for c, t in chunk.dtypes.items() if str(t).startswith("datetime64")]
+                if dates:
+                    chunk = chunk.assign(**{c: chunk[c].dt.strftime("%Y-%m-%d") for c in dates})
+                chunk = chunk.astype(object).where(chunk.notna(), None)
+                for record in chunk.to_dict("records"):
+                    fh.write(json.dumps(record, ensure_ascii=False, default=str))
+                    fh.write("\n")
+
+    _replace_atomically(path, dump)
+    return True
+
+
+def write_manifest(df, path, files):
+    """Row counts, schema and the data files written next to it."""
+    manifest = {
+        "schema_version": SCHEMA_VERSION,
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "rows": len(df),
+        "rows_by_source": {str(k): int(v) for k, v in df["Source"].value_counts(sort=False).items()},
+        "columns": {c: str(t) for c, t in df.dtypes.items()},
+        "files": {
+            os.path.basename(f): os.path.getsize(f) for f in files if os.path.exists(f)
+        },
+    }
+
+    def dump(tmp):
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(manifest, fh, indent=2)
+            fh.write("\n")
+
+    _replace_atomically(path, dump)
+    return manifest
+
+
+def write_dataset(df, output_dir, name="Combined"):
+    """
+    Write the system-of-record files and then the derived xlsx.
+
+    Returns a dict of format -> path for everything that was written.
+    """
+    paths = {
+        "parquet": os.path.join(output_dir, f"{name}.parquet"),
+        "jsonl": os.path.join(output_dir, f"{name}.jsonl"),
+        "xlsx": os.path.join(output_dir, f"{name}.xlsx"),
+    }
+    written = {}
+
+    for fmt, writer in (("parquet", write_parquet), ("jsonl", write_jsonl)):
+        try:
+            with span(f"export.{fmt}"):
+                ok = writer(df, paths[fmt])
+            if ok:
+                written[fmt] = paths[fmt]
+        except Exception:
+            print(f"❌ {fmt} export failed")
+            traceback.print_exc()
+
+    with span("export.xlsx"):
+        write_excel(df, paths["xlsx"])
+    written["xlsx"] = paths["xlsx"]
+
+    manifest_path = os.path.join(output_dir, "manifest.json")
+    write_manifest(df, manifest_path, list(written.values()))
+    written["manifest"] = manifest_path
+
+    return written
@@ -0,0 +1,109 @@
+from collections import namedtuple
+from urllib.parse import urljoin
+
+import soupsieve
+
+from scrapers.readiness import is_selenium
+from scrapers.timing import span
+
+# ======================================================
+# CARD SPECS
+# ======================================================
+# One field of a card:
+#   selector  CSS matched inside the card (None: the card element itself)
+#   attr      "text" for the visible text, else an attribute ("href" and
+#             "src" come back as absolute URLs)
+#   closest   start from this ancestor of the card instead of the card
+#   preceding match ``selector`` against the start element's preceding
+#             siblings rather than its descendants
+Field = namedtuple("Field", ["selector", "attr", "closest", "preceding"], defaults=(None, "text", None, False))
+
+URL_ATTRS = ("href", "src")
+
+# Runs in the page: every card matching spec.card as a {field: value} dict
+EXTRACT_JS = """(spec) => Array.from(document.querySelectorAll(spec.card), (card) => {
+    const row = {};
+    for (const [name, f] of Object.entries(spec.fields)) {
+        let el = f.closest ? card.closest(f.closest) : card;
+        if (el && f.preceding) {
+            el = el.previousElementSibling;
+            while (el && !el.matches(f.selector)) el = el.previousElementSibling;
+        } else if (el && f.selector) {
+            el = el.querySelector(f.selector);
+        }
+        if (!el) {
+            row[name] = null;
+        } else if (f.attr === "text") {
+            row[name] = (el.innerText || el.textContent || "").trim();
+        } else if (spec.url_attrs.includes(f.attr)) {
+            row[name] = el[f.attr] || el.getAttribute(f.attr);
+        } else {
+            row[name] = el.getAttribute(f.attr);
+        }
+    }
+    return row;
+})"""
+
+
+class CardSpec:
+    """
+    The cards of a listing page and the fields read from each, declared
+    once per scraper.
+
+    ``extract`` pulls every card of a live page (WebDriver or Playwright)
+    in a single script call, so its cost hardly depends on the number of
+    cards; ``extract_soup`` reads the same fields from parsed HTML.
+
+        CardSpec("a.card-link", title="p.title", link=Field(attr="href"))
+
+    A field given as a string is the visible text of that selector.
+    """
+
+    def __init__(self, card, **fields):
+        self.card = card
+        self.fields = {
+            name: Field(f) if isinstance(f, str) else f
+            for name, f in fields.items()
+        }
+
+    def _arg(self):
+        return {
+            "card": self.card,
+            "fields": {name: f._asdict() for name, f in self.fields.items()},
+            "url_attrs": list(URL_ATTRS),
+        }
+
+    def extract(self, page):
+        """Every card on ``page`` as a dict of its fields (None where missing)."""
+        with span("extract"):
+            if is_selenium(page):
+                return page.execute_script(f"return ({EXTRACT_JS})(arguments[0]);", self._arg())
+            return page.evaluate(EXTRACT_JS, self._arg())
+
+    def _soup_field(self, card, f, base_url):
+        el = soupsieve.closest(f.closest, card) if f.closest else card
+        if el is not None and f.preceding:
+            el = next((s for s in el.find_previous_siblings() if soupsieve.match(f.selector, s)), None)
+        elif el is not None and f.selector:
+            el = el.select_one(f.selector)
+
+        if el is None:
+            return None
+        if f.attr == "text":
+            return el.get_text(" ", strip=True)
+
+        value = el.get(f.attr)
+        if f.attr in URL_ATTRS and value and base_url:
+            return urljoin(base_url, value)
+        return value
+
+    def extract_soup(self, soup, base_url=None):
+        """``extract`` over parsed HTML; URL attributes are resolved against ``base_url``."""
+        if soup is None:
+            return []
+
+        with span("extract"):
+            return [
+                {name: self._soup_field(card, f, base_url) for name, f in self.fields.items()}
+                for card in soup.select(self.card)
+            ]
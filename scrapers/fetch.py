@@ -0,0 +1,266 @@
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+from bs4 import BeautifulSoup
+from urllib3.util.retry import Retry
+
+from scrapers.cache import PageCache
+from scrapers.replay import ArchiveAdapter
+from scrapers.timing import span
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+# ======================================================
+# CONFIG
+# ======================================================
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0 Safari/537.36"
+)
+
+HTTP_TIMEOUT = 20
+
+
+# ======================================================
+# HELPERS
+# ======================================================
+def parse_html(html):
+    return BeautifulSoup(html or "", HTML_PARSER)
+
+
+def select_text(soup, selector):
+    if soup is None:
+        return ""
+    node = soup.select_one(selector)
+    return node.get_text(" ", strip=True) if node else ""
+
+
+def new_session(pool_size=8):
+    session = requests.Session()
+    session.headers.update({
+        "User-Agent": USER_AGENT,
+        "Accept": "text/html,application/xhtml+xml,application/json;q=0.9,*/*;q=0.8",
+        "Accept-Language": "en-US,en;q=0.9",
+    })
+
+    # records / replays responses under --record / --replay, plain HTTPAdapter otherwise
+    adapter = ArchiveAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=Retry(total=2, backoff_factor=0.5, status_forcelist=(502, 503, 504))
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# ======================================================
+# FETCHER
+# ======================================================
+class Fetcher:
+    """
+    HTTP-first page loader for one source.
+
+    Pages are requested over a pooled keep-alive session and parsed with a
+    fast HTML parser. When the ``expect`` selector is missing (client-side
+    rendered page, bot wall, error) the page is handed to ``render``, a
+    callable returning the browser-rendered HTML for the URL.
+    """
+
+    def __init__(self, source, pool_size=8, timeout=HTTP_TIMEOUT, cache=None):
+        self.source = source
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.session = new_session(pool_size)
+        self.cache = cache if cache is not None else PageCache(source)
+        self.stats = Counter()
+        self._lock = threading.Lock()
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def get_html(self, url):
+        """HTTP GET through the page cache, revalidating stale entries."""
+        entry = self.cache.get(url, "http")
+        if entry is not None and entry.fresh:
+            return entry.body
+
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        with span("http_fetch"):
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+
+        if response.status_code == 304 and entry is not None:
+            self.cache.refresh(url, "http")
+            return entry.body
+
+        response.raise_for_status()
+        self.cache.put(
+            url,
+            response.text,
+            "http",
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified")
+        )
+        return response.text
+
+    def _fetch_http(self, url, expect):
+        try:
+            soup = parse_html(self.get_html(url))
+        except requests.RequestException:
+            return None
+
+        if soup.select_one(expect) is None:
+            return None
+
+        self._count("http")
+        return soup
+
+    def _rendered(self, html):
+        if not html:
+            self._count("failed")
+            return None
+
+        self._count("browser")
+        return parse_html(html)
+
+    def render_html(self, url, render):
+        """Browser-rendered HTML through the page cache."""
+        entry = self.cache.get(url, "browser")
+        if entry is not None and entry.fresh:
+            return entry.body
+
+        with span("render"):
+            html = render(url)
+        if html:
+            self.cache.put(url, html, "browser")
+        return html
+
+    def render_batch(self, urls, render_many):
+        """``render_html`` for a whole batch handed to a concurrent renderer."""
+        html = {}
+        todo = []
+        for url in urls:
+            entry = self.cache.get(url, "browser")
+            if entry is not None and entry.fresh:
+                html[url] = entry.body
+            else:
+                todo.append(url)
+
+        try:
+            rendered = render_many(todo)
+        except Exception:
+            rendered = [None] * len(todo)
+
+        for url, body in zip(todo, rendered):
+            html[url] = body
+            if body:
+                self.cache.put(url, body, "browser")
+
+        return [html.get(url) for url in urls]
+
+    def fetch(self, url, expect, render=None, fast=True):
+        """Return a parsed page for ``url`` or None when every path failed."""
+        if fast:
+            soup = self._fetch_http(url, expect)
+            if soup is not None:
+                return soup
+
+        if render is None:
+            self._count("failed")
+            return None
+
+        try:
+            html = self.render_html(url, render)
+        except Exception:
+            html = None
+
+        return self._rendered(html)
+
+    def fetch_many(self, urls, expect, render=None, fast=True, workers=None, render_many=None):
+        """
+        Fetch several pages concurrently; results keep the order of ``urls``.
+
+        With ``render_many`` (e.g. AsyncBrowserEngine.renderer) the HTTP pass
+        runs first and all misses are rendered as one concurrent batch.
+        """
+        urls = list(urls)
+        workers = workers or self.pool_size
+
+        if render_many is None:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                return list(executor.map(lambda u: self.fetch(u, expect, render, fast), urls))
+
+        if fast:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                soups = list(executor.map(lambda u: self._fetch_http(u, expect), urls))
+        else:
+            soups = [None] * len(urls)
+
+        misses = [i for i, soup in enumerate(soups) if soup is None]
+        rendered = self.render_batch([urls[i] for i in misses], render_many)
+
+        for i, html in zip(misses, rendered):
+            soups[i] = self._rendered(html)
+
+        return soups
+
+    def iter_many(self, urls, expect, render=None, fast=True, workers=None, render_many=None):
+        """
+        ``fetch_many`` that yields ``(url, soup)`` pairs as pages complete.
+
+        Pages served over HTTP come out first; with ``render_many`` the
+        misses follow once their browser batch is done.
+        """
+        urls = list(urls)
+        workers = workers or self.pool_size
+
+        if render_many is None:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {executor.submit(self.fetch, u, expect, render, fast): u for u in urls}
+                for future in as_completed(futures):
+                    yield futures[future], future.result()
+            return
+
+        misses = urls
+        if fast:
+            misses = []
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {executor.submit(self._fetch_http, u, expect): u for u in urls}
+                for future in as_completed(futures):
+                    soup = future.result()
+                    if soup is None:
+                        misses.append(futures[future])
+                    else:
+                        yield futures[future], soup
+
+        for url, html in zip(misses, self.render_batch(misses, render_many)):
+            yield url, self._rendered(html)
+
+    def report(self):
+        print(
+            f"🌐 {self.source} pages: {self.stats['http']} via HTTP, "
+            f"{self.stats['browser']} via browser, {self.stats['failed']} failed"
+        )
+
+    def close(self):
+        self.session.close()
+        self.cache.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,90 @@
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from scrapers.deadlines import EXACT, parse_deadline
+from scrapers.timing import span
+
+# ======================================================
+# CONFIG
+# ======================================================
+TIMEOUT = 30
+
+# Names sites commonly give their paging parameters, in the query string
+# or the JSON body of a search request
+PAGE_PARAMS = ("page", "page_no", "pageNo", "pageNumber", "pageIndex")
+SIZE_PARAMS = ("limit", "per_page", "perPage", "page_size", "pageSize", "size")
+TOTAL_KEYS = ("total", "totalCount", "total_count", "totalElements", "totalItems", "count")
+
+
+# ======================================================
+# JSON HELPERS
+# ======================================================
+def first_value(item, keys):
+    """Value of the first of ``keys`` that ``item`` has non-empty."""
+    for key in keys:
+        value = item.get(key)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def find_records(payload, keys):
+    """
+    The largest list of objects anywhere in ``payload`` that has at least
+    one object with one of ``keys`` (e.g. title keys) set.
+    """
+    best = []
+    stack = [payload]
+
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            items = [x for x in node if isinstance(x, dict)]
+            if len(items) > len(best) and any(first_value(x, keys) for x in items):
+                best = items
+            stack.extend(node)
+
+    return best
+
+
+def find_total(payload):
+    """A total result count at the top of ``payload`` (or one level down), else None."""
+    nodes = [payload] + [v for v in payload.values() if isinstance(v, dict)] if isinstance(payload, dict) else []
+    for node in nodes:
+        value = first_value(node, TOTAL_KEYS)
+        if isinstance(value, int) or (isinstance(value, str) and value.isdigit()):
+            return int(value)
+    return None
+
+
+def deadline_text(value, source):
+    """A JSON deadline as text; ISO timestamps become their date in DEADLINE_TZ."""
+    text = str(value or "").strip()
+    parsed = parse_deadline(text, source)
+    if parsed.confidence == EXACT and text[:4].isdigit():
+        return parsed.date.isoformat()
+    return text
+
+
+# ======================================================
+# REQUESTS
+# ======================================================
+def query_params(url):
+    return dict(parse_qsl(urlsplit(url).query, keep_blank_values=True))
+
+
+def with_params(url, **params):
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query, keep_blank_values=True))
+    query.update({k: str(v) for k, v in params.items()})
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def get_json(session, url, method="GET", body=None, timeout=TIMEOUT):
+    with span("api_fetch"):
+        response = session.request(
+            method, url, json=body, timeout=timeout, headers={"Accept": "application/json"}
+        )
+    response.raise_for_status()
+    return response.json()
@@ -0,0 +1,88 @@
+import re
+
+import pandas as pd
+
+# ======================================================
+# OUTPUT SCHEMA
+# ======================================================
+FINAL_COLUMNS = [
+    "Source",
+    "Title",
+    "Description",
+    "Matched_Vertical",
+    "Deadline",
+    "Apply_Link"
+]
+
+
+# ======================================================
+# CLEAN LINK FUNCTION
+# ======================================================
+def clean_link(link):
+    if not isinstance(link, str) or not link.strip():
+        return ""
+
+    link = link.strip()
+
+    if 'HYPERLINK(' in link:
+        match = re.search(r'HYPERLINK\("([^"]+)"', link)
+        if match:
+            return match.group(1)
+
+    return link
+
+
+# ======================================================
+# CLEAN DESCRIPTION FUNCTION
+# ======================================================
+def clean_description(desc):
+    if not desc or str(desc).strip().lower() in ["", "nan", "none"]:
+        return "No description available"
+    return str(desc).strip()
+
+
+# ======================================================
+# VECTORIZED COLUMNS
+# ======================================================
+HYPERLINK_RE = r'HYPERLINK\("([^"]+)"'
+
+MISSING_DESCRIPTIONS = ["", "nan", "none"]
+
+
+def clean_links(links):
+    """``clean_link`` over a whole Series with pandas string operations."""
+    text = links.where(links.map(type) == str, "").astype(str).str.strip()
+    formula = text.str.extract(HYPERLINK_RE, expand=False)
+    return formula.fillna(text)
+
+
+def clean_descriptions(descriptions):
+    """``clean_description`` over a whole Series with pandas string operations."""
+    text = descriptions.astype(str).str.strip()
+    missing = descriptions.isna() | text.str.lower().isin(MISSING_DESCRIPTIONS)
+    return text.mask(missing, "No description available")
+
+
+# ======================================================
+# FRAME NORMALIZATION
+# ======================================================
+def normalize_frame(df, source, column_map=None):
+    """Rename a scraper's frame to FINAL_COLUMNS and clean it column-wise."""
+    if df is None or df.empty:
+        return pd.DataFrame(columns=FINAL_COLUMNS)
+
+    out = df.rename(columns=column_map or {}).reindex(columns=FINAL_COLUMNS)
+
+    out["Source"] = source
+    out["Description"] = clean_descriptions(out["Description"])
+    out["Apply_Link"] = clean_links(out["Apply_Link"])
+
+    return out.reset_index(drop=True)
+
+
+def combine_frames(frames):
+    """Concatenate normalized frames in one pass."""
+    frames = [f for f in frames if f is not None and not f.empty]
+    if not frames:
+        return pd.DataFrame(columns=FINAL_COLUMNS)
+    return pd.concat(frames, ignore_index=True)[FINAL_COLUMNS]
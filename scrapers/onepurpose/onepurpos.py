@@ -1,123 +1,240 @@
-import time
+import os
+import threading
 import pandas as pd
-from datetime import datetime
 
-from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.common.by import By
 
+from scrapers import deadlines
+from scrapers.browser import measure_page, new_chrome_driver
+from scrapers.classifier import classify, label
+from scrapers.driver_pool import DriverPool
+from scrapers.extract import CardSpec, Field
+from scrapers.fetch import Fetcher, new_session, select_text
+from scrapers.onepurpose import onepurpos_api
+from scrapers.pushdown import DEADLINE, DEDUP, FetchPlan
+from scrapers.readiness import navigate, scroll_until_stable, wait_for_count_stable, wait_for_selector
+from scrapers.registry import Scraper, register
+from scrapers.store import PostingStore
 
-URLS = {
-    "Grants": "https://onepurpos.in/openings/grants",
-    "RFPs": "https://onepurpos.in/openings/rfps"
-}
 
+# Registry name, also the key of this source's plan, cache, store and
+# blocking policy
+SOURCE = "onepurpos"
 
-KEYWORDS = {
-    "Governance": ["governance", "policy", "capacity", "government", "data"],
-    "Learning": ["education", "training", "skill", "learning"],
-    "Safety": ["safety", "gender", "health", "protection"],
-    "Climate": ["climate", "environment", "sustainability", "energy"]
+# Override to point at a fixture site (benchmarks/sites.py)
+BASE_URL = os.getenv("ONEPURPOS_BASE_URL", "https://onepurpos.in")
+
+URLS = {
+    "Grants": f"{BASE_URL}/openings/grants",
+    "RFPs": f"{BASE_URL}/openings/rfps"
 }
 
+# "api" reads the JSON behind the listing pages (onepurpos_api), "browser"
+# reads the rendered cards
+MODE = os.getenv("ONEPURPOS_MODE", "api")
 
-def get_matched_vertical(text):
-    text = text.lower()
-    for vertical, keywords in KEYWORDS.items():
-        for keyword in keywords:
-            if keyword in text:
-                return vertical
-    return None
+# Concurrent detail fetches, and Chrome instances for pages that need one
+WORKERS = int(os.getenv("ONEPURPOS_WORKERS", "8"))
+POOL_SIZE = int(os.getenv("ONEPURPOS_POOL_SIZE", "4"))
 
+# Openings without a deadline are dropped, so a listing JSON where fewer
+# than this share have a parseable one (deadline under an unknown key) is
+# rejected and the rendered cards are read instead
+MIN_DEADLINE_SHARE = 0.5
 
-def init_driver():
-    options = webdriver.ChromeOptions()
-    options.add_argument("--headless=new")
-    options.add_argument("--window-size=1920,1080")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
 
-    return webdriver.Chrome(
+def init_driver(capture_network=False):
+    return new_chrome_driver(
+        SOURCE,
         service=Service(ChromeDriverManager().install()),
-        options=options
+        capture_network=capture_network
     )
 
 
-# 🔥 NO TAB VERSION (FAST)
-def get_description(driver, link):
-    try:
-        driver.get(link)
-        time.sleep(2)
+# Pages that may be served over plain HTTP before falling back to Chrome
+FAST_PATH = {
+    "listing": False,  # cards are rendered client-side
+    "detail": True
+}
 
-        return driver.find_element(
-            By.CSS_SELECTOR,
-            "div.details-card-body div.editor-content-main"
-        ).text.strip()
+DESCRIPTION_SELECTOR = "div.details-card-body div.editor-content-main"
 
-    except:
-        return ""
+CARDS = CardSpec(
+    "a.card-link",
+    title="p.large-card-title",
+    deadline="p.large-card-date-text",
+    link=Field(attr="href")
+)
 
 
-def scrape_onepurpose_jobs():
-    driver = init_driver()
-    all_rows = []
+# 🔥 NO TAB VERSION (FAST)
+def render_description(driver, link):
+    navigate(driver, link)
+    wait_for_selector(driver, DESCRIPTION_SELECTOR, timeout=10)
+    measure_page(driver)
+    return driver.page_source
+
+
+def is_open(deadline, today):
+    # unparseable deadlines are dropped, like expired ones
+    return deadlines.is_open(deadline, "onepurpos", today)
+
+
+# ======================================================
+# LISTING
+# ======================================================
+def listing_browser(driver, url):
+    """(title, deadline, link, description) of every rendered card."""
+    navigate(driver, url)
+    wait_for_count_stable(driver, "a.card-link", timeout=15)
+
+    # the list grows as it is scrolled
+    scroll_until_stable(driver, timeout=60)
+    measure_page(driver)
+
+    # 🔥 every card in one script call
+    return [
+        (card["title"], card["deadline"], card["link"], "")
+        for card in CARDS.extract(driver)
+        if card["title"] is not None and card["deadline"] is not None
+    ]
+
+
+def listing_api(session, url, get_driver):
+    """The complete listing of ``url`` from its JSON, in one pass."""
+    kind = url.rstrip("/").rsplit("/", 1)[-1]
+    openings = onepurpos_api.fetch_listing(session, kind, url, BASE_URL, get_driver)
+    if not openings:
+        raise LookupError("no openings in the listing JSON")
+
+    dated = sum(deadlines.parse_deadline(o["Deadline"], SOURCE).date is not None for o in openings)
+    if dated < MIN_DEADLINE_SHARE * len(openings):
+        raise LookupError(f"only {dated} of {len(openings)} openings in the listing JSON have a deadline")
+
+    print(f"✅ Found {len(openings)} OnePurpos {kind} via API")
+    return [(o["Title"], o["Deadline"], o["Apply_Link"], o["Description"]) for o in openings]
+
+
+# ======================================================
+# SCRAPER
+# ======================================================
+def iter_onepurpose_jobs(mode=MODE, workers=WORKERS, pool_size=POOL_SIZE):
+    today = deadlines.today()
+    plan = FetchPlan(SOURCE, {DEADLINE, DEDUP}, require_deadline=True, on=today)
+    session = new_session(workers)
+
+    # one Chrome for listings, started only when a listing needs it
+    listing_driver = []
+    driver_lock = threading.Lock()
+
+    def get_driver():
+        with driver_lock:
+            if not listing_driver:
+                listing_driver.append(init_driver(capture_network=(mode == "api")))
+            return listing_driver[0]
+
+    def get_listing(url):
+        if mode == "api":
+            try:
+                return listing_api(session, url, get_driver)
+            except Exception as e:
+                print(f"⚠ OnePurpos API listing failed for {url} ({e}), falling back to browser")
+
+        return listing_browser(get_driver(), url)
 
     try:
-        for _, url in URLS.items():
-            driver.get(url)
-            time.sleep(4)
-
-            # scroll
-            last_height = driver.execute_script("return document.body.scrollHeight")
-            while True:
-                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(1.5)
-                new_height = driver.execute_script("return document.body.scrollHeight")
-                if new_height == last_height:
-                    break
-                last_height = new_height
-
-            cards = driver.find_elements(By.CSS_SELECTOR, "a.card-link")
-
-            for card in cards[:20]:  # 🔥 LIMIT (IMPORTANT for speed)
-                try:
-                    link = card.get_attribute("href")
-                    title = card.find_element(By.CSS_SELECTOR, "p.large-card-title").text
-                    deadline = card.find_element(By.CSS_SELECTOR, "p.large-card-date-text").text
-
-                    description = get_description(driver, link)
-
-                    combined = f"{title} {description}"
-                    vertical = get_matched_vertical(combined)
-
-                    if vertical:
-                        all_rows.append({
-                            "Title": title,
-                            "Description": description,
-                            "Matched_Vertical": vertical,
-                            "Deadline": deadline,
-                            "Apply_Link": link
-                        })
-
-                    driver.back()
-                    time.sleep(1)
-
-                except:
-                    continue
+        with Fetcher(SOURCE, pool_size=workers) as fetcher, \
+                DriverPool(init_driver, size=pool_size) as pool, \
+                PostingStore(SOURCE) as store:
+            def posting(title, deadline, link, description, fetched):
+                vertical = label(classify(f"{title} {description}", SOURCE))
+
+                if fetched:
+                    store.save(
+                        link,
+                        Title=title,
+                        Description=description,
+                        Deadline=deadline,
+                        Matched_Vertical=vertical
+                    )
+
+                if vertical and is_open(deadline, today):
+                    return {
+                        "Title": title,
+                        "Description": description,
+                        "Matched_Vertical": vertical,
+                        "Deadline": deadline,
+                        "Apply_Link": link
+                    }
+                return None
+
+            for _, url in URLS.items():
+                listing = get_listing(url)
+
+                # 🔽 expired, undated and repeated cards never reach a detail page
+                listing = [card for card, _ in plan.plan(listing, lambda card: card[:3])]
+
+                # 💾 skip detail pages already fetched on earlier runs, and
+                # those whose description came with the listing
+                pending = {}
+                for title, deadline, link, description in listing:
+                    if description:
+                        row = posting(title, deadline, link, description, True)
+                    else:
+                        known = store.lookup(link)
+                        if known is None:
+                            pending[link] = (title, deadline)
+                            continue
+                        row = posting(title, deadline, link, known["Description"] or "", False)
+
+                    if row:
+                        yield row
+
+                for link, page in fetcher.iter_many(
+                    list(pending),
+                    DESCRIPTION_SELECTOR,
+                    render=lambda link: pool.run(render_description, link),
+                    fast=FAST_PATH["detail"]
+                ):
+                    title, deadline = pending[link]
+                    description = select_text(page, DESCRIPTION_SELECTOR)
+
+                    row = posting(title, deadline, link, description, page is not None)
+                    if row:
+                        yield row
+
+            plan.report()
+            fetcher.report()
+            store.report()
 
     finally:
-        driver.quit()
+        session.close()
+        for driver in listing_driver:
+            driver.quit()
 
-    if not all_rows:
-        return pd.DataFrame()
 
-    df = pd.DataFrame(all_rows)
+def scrape_onepurpose_jobs():
+    rows = list(iter_onepurpose_jobs())
+    if not rows:
+        return pd.DataFrame()
 
-    df['Deadline_Date'] = pd.to_datetime(df['Deadline'], errors='coerce')
-    today = pd.Timestamp(datetime.today().date())
-    df = df[df['Deadline_Date'] >= today]
+    df = pd.DataFrame(rows)
 
+    df['Deadline_Date'] = deadlines.parse_deadlines(df['Deadline'], "onepurpos")[deadlines.DATE_COLUMN]
     df = df.sort_values("Deadline_Date")
 
     return df[["Title", "Description", "Matched_Vertical", "Deadline", "Apply_Link"]]
+
+
+# ======================================================
+# PLUGIN
+# ======================================================
+@register
+class OnePurposScraper(Scraper):
+    name = SOURCE
+    order = 30
+    time_budget = 10 * 60
+
+    def records(self):
+        return iter_onepurpose_jobs()
@@ -0,0 +1,130 @@
+import os
+from urllib.parse import urljoin
+
+from scrapers.browser import captured_json
+from scrapers.fetch import parse_html
+from scrapers.jsonapi import (
+    PAGE_PARAMS, SIZE_PARAMS, deadline_text, find_records, first_value, get_json, query_params, with_params
+)
+from scrapers.readiness import navigate, wait_for_count_stable
+
+# ======================================================
+# CONFIG
+# ======================================================
+# Direct listing endpoint, "{kind}" being "grants" or "rfps". Left empty,
+# the endpoint is captured from the requests the listing page itself makes.
+API_URL = os.getenv("ONEPURPOS_API_URL", "")
+
+# A page-size parameter on the endpoint is raised to this so the whole
+# list comes back in one response
+MAX_PAGE_SIZE = 1000
+MAX_PAGES = 200
+
+# Where an opening's fields may be in the JSON; the first non-empty key wins
+TITLE_KEYS = ("title", "name", "opening_title", "heading")
+DEADLINE_KEYS = ("deadline", "last_date", "lastDate", "end_date", "endDate", "closing_date", "apply_by", "due_date")
+LINK_KEYS = ("url", "link", "permalink")
+SLUG_KEYS = ("slug", "id", "_id")
+DESCRIPTION_KEYS = ("description", "details", "content", "body")
+
+
+# ======================================================
+# JSON → SCHEMA
+# ======================================================
+def find_openings(payload):
+    """The largest list of opening-like objects anywhere in ``payload``."""
+    return find_records(payload, TITLE_KEYS)
+
+
+def opening_link(item, kind, base_url):
+    link = first_value(item, LINK_KEYS)
+    if isinstance(link, str):
+        return urljoin(base_url + "/", link)
+
+    # the site's own links are /openings/<kind>/<slug>
+    slug = first_value(item, SLUG_KEYS)
+    return f"{base_url}/openings/{kind}/{slug}" if slug is not None else ""
+
+
+def map_opening(item, kind, base_url):
+    description = first_value(item, DESCRIPTION_KEYS)
+
+    return {
+        "Title": str(first_value(item, TITLE_KEYS) or "").strip(),
+        "Deadline": deadline_text(first_value(item, DEADLINE_KEYS), "onepurpos"),
+        "Apply_Link": opening_link(item, kind, base_url),
+        "Description": parse_html(description).get_text(" ", strip=True) if isinstance(description, str) else ""
+    }
+
+
+# ======================================================
+# FETCHING
+# ======================================================
+def _key(item):
+    return str(first_value(item, LINK_KEYS + SLUG_KEYS) or first_value(item, TITLE_KEYS))
+
+
+def fetch_openings(session, endpoint, first=None):
+    """
+    Every opening behind ``endpoint``.
+
+    A page-size parameter is raised to MAX_PAGE_SIZE; when the endpoint is
+    also paged, pages are read until one brings nothing new. ``first`` is
+    an already captured response for ``endpoint`` as it was called.
+    """
+    query = query_params(endpoint)
+    size_param = next((p for p in SIZE_PARAMS if p in query), None)
+    page_param = next((p for p in PAGE_PARAMS if p in query), None)
+
+    if size_param:
+        endpoint = with_params(endpoint, **{size_param: MAX_PAGE_SIZE})
+        first = None
+
+    unique = {}
+    page = int(query[page_param]) if page_param and query[page_param].isdigit() else 1
+
+    items = find_openings(first if first is not None else get_json(session, endpoint))
+    for _ in range(MAX_PAGES):
+        added = 0
+        for item in items:
+            if _key(item) not in unique:
+                unique[_key(item)] = item
+                added += 1
+
+        if not page_param or not added:
+            break
+
+        page += 1
+        items = find_openings(get_json(session, with_params(endpoint, **{page_param: page})))
+
+    return list(unique.values())
+
+
+def capture_endpoint(driver, url):
+    """Load the listing page and return (endpoint, payload) of its opening list request."""
+    navigate(driver, url)
+    wait_for_count_stable(driver, "a.card-link", timeout=15)
+
+    captured = [(len(find_openings(c.payload)), c) for c in captured_json(driver) if c.method == "GET"]
+    captured = [(n, c) for n, c in captured if n]
+    if not captured:
+        raise LookupError(f"no opening list among the JSON responses of {url}")
+
+    _, response = max(captured, key=lambda nc: nc[0])
+    return response.url, response.payload
+
+
+def fetch_listing(session, kind, url, base_url, get_driver=None):
+    """
+    Openings of one listing page (``kind`` "grants" or "rfps") as schema
+    dicts, from API_URL or from the endpoint the page was seen calling;
+    ``get_driver`` returns a ``capture_network`` driver and is only called
+    when there is no API_URL.
+    """
+    if API_URL:
+        endpoint, first = API_URL.format(kind=kind), None
+    else:
+        endpoint, first = capture_endpoint(get_driver(), url)
+
+    openings = [map_opening(item, kind, base_url) for item in fetch_openings(session, endpoint, first)]
+    return [o for o in openings if o["Title"] and o["Apply_Link"]]
@@ -0,0 +1,122 @@
+import threading
+from collections import Counter, defaultdict
+
+import pandas as pd
+
+from scrapers.classifier import classify_many
+from scrapers.deadlines import parse_deadline, today
+from scrapers.store import canonical_link
+
+# ======================================================
+# PREDICATES
+# ======================================================
+# What a scraper may decide from a listing card alone, before any detail
+# page is opened. A scraper only declares the predicates whose outcome the
+# detail page cannot change (e.g. KEYWORD only where matching is on the
+# title anyway).
+DEADLINE = "deadline"   # the card's deadline has passed
+KEYWORD = "keyword"     # the card's title matches no vertical
+DEDUP = "dedup"         # the card's link was already planned in this run
+
+# Per-source counters for this process: cards seen, planned (kept) and the
+# reason each other card was dropped
+STATS = defaultdict(Counter)
+_stats_lock = threading.Lock()
+
+REASONS = ("expired", "no_deadline", "off_topic", "duplicate")
+
+
+def pushdown_stats():
+    with _stats_lock:
+        return {source: dict(counts) for source, counts in STATS.items()}
+
+
+def avoided(counts):
+    return int(sum(counts.get(reason, 0) for reason in REASONS))
+
+
+def format_stats(stats):
+    lines = []
+    for source, counts in sorted(stats.items()):
+        if not counts.get("cards"):
+            continue
+        reasons = ", ".join(f"{int(counts[r])} {r.replace('_', ' ')}" for r in REASONS if counts.get(r))
+        lines.append(
+            f"🔽 {source} pushdown: {int(counts.get('planned', 0))} of {int(counts['cards'])} cards "
+            f"planned, {avoided(counts)} detail fetches avoided" + (f" ({reasons})" if reasons else "")
+        )
+    return lines
+
+
+# ======================================================
+# FETCH PLAN
+# ======================================================
+class FetchPlan:
+    """
+    Filter listing cards on their cheap fields before detail fetches.
+
+    ``plan`` takes the cards of a listing and a ``fields`` callable returning
+    ``(title, deadline, link)`` for a card, applies the scraper's predicates
+    and returns the cards worth a detail fetch as ``(card, match)`` pairs;
+    ``match`` is the title's Classification under KEYWORD, else None.
+
+    With ``require_deadline`` a card whose deadline cannot be parsed is
+    dropped too (sources that never publish postings without one).
+    """
+
+    def __init__(self, source, predicates, require_deadline=False, on=None):
+        self.source = source
+        self.predicates = frozenset(predicates)
+        self.require_deadline = require_deadline
+        self.on = pd.Timestamp(today() if on is None else on).date()
+        self.seen = set()
+        self.stats = STATS[source]
+
+    def _count(self, name, n=1):
+        with _stats_lock:
+            self.stats[name] += n
+
+    def _reject(self, title, deadline, link, match):
+        if DEDUP in self.predicates and link and canonical_link(link) in self.seen:
+            return "duplicate"
+
+        if DEADLINE in self.predicates:
+            date = parse_deadline(deadline, self.source).date
+            if date is None and self.require_deadline:
+                return "no_deadline"
+            if date is not None and date < self.on:
+                return "expired"
+
+        if match is not None and not match.verticals:
+            return "off_topic"
+
+        return None
+
+    def plan(self, cards, fields):
+        cards = list(cards)
+        values = [fields(card) for card in cards]
+
+        if KEYWORD in self.predicates:
+            matches = classify_many((title or "" for title, _, _ in values), self.source)
+        else:
+            matches = [None] * len(cards)
+
+        kept = []
+        for card, (title, deadline, link), match in zip(cards, values, matches):
+            self._count("cards")
+
+            reason = self._reject(title, deadline, link, match)
+            if reason:
+                self._count(reason)
+                continue
+
+            if link:
+                self.seen.add(canonical_link(link))
+            self._count("planned")
+            kept.append((card, match))
+
+        return kept
+
+    def report(self):
+        for line in format_stats({self.source: self.stats}):
+            print(line)
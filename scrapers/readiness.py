@@ -0,0 +1,229 @@
+import json
+import time
+import asyncio
+import threading
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+from scrapers.timing import record_span, span
+
+# ======================================================
+# WAIT LOG
+# ======================================================
+# host → condition → [number of waits, seconds spent]
+WAIT_LOG = defaultdict(lambda: defaultdict(lambda: [0, 0.0]))
+_log_lock = threading.Lock()
+
+
+def _current_url(page):
+    try:
+        return page.url if not hasattr(page, "execute_script") else page.current_url
+    except Exception:
+        return ""
+
+
+def record_wait(page, condition, seconds):
+    host = urlsplit(_current_url(page)).netloc or "unknown"
+    with _log_lock:
+        entry = WAIT_LOG[host][condition]
+        entry[0] += 1
+        entry[1] += seconds
+
+    record_span("scroll" if condition == "scroll" else f"wait.{condition}", seconds)
+
+
+def wait_stats():
+    with _log_lock:
+        return {
+            host: {cond: {"waits": n, "seconds": round(sec, 3)} for cond, (n, sec) in conds.items()}
+            for host, conds in WAIT_LOG.items()
+        }
+
+
+def format_stats(stats):
+    lines = []
+    for host, conds in sorted(stats.items()):
+        parts = ", ".join(
+            f"{cond} {v['seconds']:.1f}s/{v['waits']}" for cond, v in sorted(conds.items())
+        )
+        lines.append(f"⏳ {host} waits: {parts}")
+    return lines
+
+
+# ======================================================
+# DRIVER ADAPTER (PLAYWRIGHT + SELENIUM)
+# ======================================================
+def is_selenium(page):
+    return hasattr(page, "execute_script")
+
+
+def evaluate(page, expression):
+    """Evaluate a JS expression in either a Playwright page or a WebDriver."""
+    if is_selenium(page):
+        return page.execute_script(f"return ({expression});")
+    return page.evaluate(f"() => ({expression})")
+
+
+def navigate(page, url, timeout=60):
+    """Load ``url`` in either driver, timed as the "navigation" stage."""
+    with span("navigation"):
+        if is_selenium(page):
+            page.get(url)
+        else:
+            page.goto(url, timeout=timeout * 1000, wait_until="domcontentloaded")
+
+
+# ======================================================
+# SYNC / ASYNC STEPS
+# ======================================================
+# A condition that both sync pages and ``playwright.async_api`` pages wait
+# on is written once, as a generator that yields what it needs from the
+# page and gets the answer sent back:
+#   ("evaluate", expression)    value of the JS expression
+#   ("selector", selector, s)   True once selector is attached, False after s seconds
+#   ("sleep", s)                None, s seconds later
+# ``drive`` runs such a generator on a sync page, ``drive_async`` on an async one.
+def _do(page, step):
+    kind, *args = step
+    if kind == "evaluate":
+        return evaluate(page, *args)
+    if kind == "selector":
+        selector, timeout = args
+        try:
+            page.wait_for_selector(selector, timeout=timeout * 1000, state="attached")
+            return True
+        except Exception:
+            return False
+    time.sleep(*args)
+
+
+async def _do_async(page, step):
+    kind, *args = step
+    if kind == "evaluate":
+        return await page.evaluate(f"() => ({args[0]})")
+    if kind == "selector":
+        selector, timeout = args
+        try:
+            await page.wait_for_selector(selector, timeout=timeout * 1000, state="attached")
+            return True
+        except Exception:
+            return False
+    await asyncio.sleep(*args)
+
+
+def drive(page, steps):
+    """Run the step generator ``steps`` on a sync page; returns its return value."""
+    value = None
+    try:
+        while True:
+            value = _do(page, steps.send(value))
+    except StopIteration as stop:
+        return stop.value
+
+
+async def drive_async(page, steps):
+    """``drive`` for a ``playwright.async_api`` page."""
+    value = None
+    try:
+        while True:
+            value = await _do_async(page, steps.send(value))
+    except StopIteration as stop:
+        return stop.value
+
+
+def _count_expr(selector):
+    return f"document.querySelectorAll({json.dumps(selector)}).length"
+
+
+def poll(page, condition, probe, timeout, interval=0.1):
+    """Call ``probe()`` until it returns a truthy value or ``timeout`` passes."""
+    start = time.monotonic()
+    value = None
+
+    while True:
+        try:
+            value = probe()
+        except Exception:
+            value = None
+
+        if value or time.monotonic() - start >= timeout:
+            break
+        time.sleep(interval)
+
+    record_wait(page, condition, time.monotonic() - start)
+    return value
+
+
+# ======================================================
+# CONDITIONS
+# ======================================================
+def wait_for_selector(page, selector, timeout=15):
+    """Return True as soon as ``selector`` is in the DOM, False on timeout."""
+    if is_selenium(page):
+        return bool(poll(page, "selector", lambda: evaluate(page, _count_expr(selector)), timeout))
+    return drive(page, selector_steps(page, selector, timeout))
+
+
+def selector_steps(page, selector, timeout=15):
+    """Steps of ``wait_for_selector`` on a Playwright page."""
+    start = time.monotonic()
+    found = yield ("selector", selector, timeout)
+    record_wait(page, "selector", time.monotonic() - start)
+    return found
+
+
+def wait_for_count_stable(page, selector, timeout=15, quiet=0.5, interval=0.1):
+    """
+    Wait until at least one ``selector`` match exists and the match count has
+    not changed for ``quiet`` seconds. Returns the final count.
+    """
+    state = {"count": -1, "since": time.monotonic()}
+
+    def probe():
+        count = evaluate(page, _count_expr(selector))
+        now = time.monotonic()
+        if count != state["count"]:
+            state["count"], state["since"] = count, now
+            return False
+        return count > 0 and now - state["since"] >= quiet
+
+    poll(page, "count_stable", probe, timeout, interval)
+    return max(state["count"], 0)
+
+
+def scroll_until_stable(page, timeout=30, quiet=1.0, max_rounds=50, interval=0.1):
+    """
+    Scroll to the bottom until ``document.body.scrollHeight`` stops growing.
+
+    After each scroll the page gets up to ``quiet`` seconds to append more
+    content; the loop ends on the first round where the height stays put.
+    Returns the number of scroll rounds.
+    """
+    return drive(page, scroll_steps(page, timeout, quiet, max_rounds, interval))
+
+
+def scroll_steps(page, timeout=30, quiet=1.0, max_rounds=50, interval=0.1):
+    """Steps of ``scroll_until_stable``."""
+    start = time.monotonic()
+    height = yield ("evaluate", "document.body.scrollHeight")
+    rounds = 0
+
+    while rounds < max_rounds and time.monotonic() - start < timeout:
+        yield ("evaluate", "window.scrollTo(0, document.body.scrollHeight)")
+        rounds += 1
+
+        grown = None
+        deadline = time.monotonic() + quiet
+        while time.monotonic() < deadline:
+            new_height = yield ("evaluate", "document.body.scrollHeight")
+            if new_height > height:
+                grown = new_height
+                break
+            yield ("sleep", interval)
+
+        if grown is None:
+            break
+        height = grown
+
+    record_wait(page, "scroll", time.monotonic() - start)
+    return rounds
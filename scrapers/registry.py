@@ -0,0 +1,60 @@
+import pkgutil
+import importlib
+
+import scrapers
+from scrapers.normalize import normalize_frame
+
+# ======================================================
+# REGISTRY
+# ======================================================
+REGISTRY = {}
+
+
+class Scraper:
+    """
+    Interface every source plugin implements.
+
+    ``records`` yields the source's raw rows (dicts) as they are extracted
+    and ``normalize`` maps a frame of rows to FINAL_COLUMNS (renaming
+    through ``column_map``). ``order`` fixes where the source's rows land in
+    the combined output and ``time_budget`` is its hard deadline in seconds
+    under parallel execution.
+    """
+
+    name = None
+    order = 100
+    time_budget = 10 * 60
+    column_map = {}
+
+    def records(self):
+        raise NotImplementedError(f"{self.name} does not implement records()")
+
+    def normalize(self, df):
+        return normalize_frame(df, self.name, self.column_map)
+
+    def __repr__(self):
+        return f"<Scraper {self.name}>"
+
+
+def register(cls):
+    """Class decorator adding a Scraper subclass to the registry."""
+    if not cls.name:
+        raise ValueError(f"{cls.__name__} has no name")
+    REGISTRY[cls.name] = cls()
+    return cls
+
+
+def discover(package=scrapers):
+    """Import every sub-package of ``scrapers`` so their plugins register."""
+    for module in pkgutil.iter_modules(package.__path__):
+        if module.ispkg:
+            importlib.import_module(f"{package.__name__}.{module.name}")
+
+
+def registered(names=None):
+    """Registered scrapers in output order, optionally limited to ``names``."""
+    selected = [
+        s for s in REGISTRY.values()
+        if names is None or s.name.lower() in {n.lower() for n in names}
+    ]
+    return sorted(selected, key=lambda s: (s.order, s.name))
@@ -0,0 +1,400 @@
+import os
+import ssl
+import json
+import time
+import shutil
+import sqlite3
+import hashlib
+import threading
+import subprocess
+from collections import Counter, namedtuple
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# ======================================================
+# CONFIG
+# ======================================================
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# live: go to the network; record: go to the network and archive every
+# response; replay: serve archived responses only, never touch the network
+NET_MODE = os.getenv("SCRAPER_NET_MODE", "live")
+ARCHIVE_DIR = os.getenv("SCRAPER_ARCHIVE_DIR", os.path.join(PROJECT_ROOT, "output", "archive"))
+
+MODES = ("live", "record", "replay")
+
+UPSTREAM_TIMEOUT = 60
+
+# Not meaningful once the body is stored decoded and served in one piece
+DROP_HEADERS = {
+    "connection", "keep-alive", "proxy-connection", "transfer-encoding", "te", "trailer",
+    "upgrade", "content-encoding", "content-length", "alt-svc", "strict-transport-security",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key         TEXT PRIMARY KEY,
+    method      TEXT NOT NULL,
+    url         TEXT NOT NULL,
+    status      INTEGER NOT NULL,
+    headers     TEXT NOT NULL,
+    body_sha    TEXT NOT NULL,
+    size        INTEGER NOT NULL,
+    recorded_at REAL NOT NULL
+)
+"""
+
+Recorded = namedtuple("Recorded", ["status", "headers", "body"])
+
+# Counters for this process (recorded, replayed, missing)
+STATS = Counter()
+_stats_lock = threading.Lock()
+
+_state = {"mode": NET_MODE if NET_MODE in MODES else "live", "dir": ARCHIVE_DIR}
+
+
+def configure(mode, archive_dir=None):
+    """Switch the network mode of this process (and of workers forked later)."""
+    if mode not in MODES:
+        raise ValueError(f"unknown network mode {mode!r}, expected one of {MODES}")
+    _state["mode"] = mode
+    if archive_dir:
+        _state["dir"] = archive_dir
+
+
+def mode():
+    return _state["mode"]
+
+
+def archive_dir():
+    return _state["dir"]
+
+
+def recording():
+    return _state["mode"] == "record"
+
+
+def replaying():
+    return _state["mode"] == "replay"
+
+
+def active():
+    """True when responses are being recorded or replayed (caches stay out of the way)."""
+    return _state["mode"] != "live"
+
+
+def _count(name, n=1):
+    with _stats_lock:
+        STATS[name] += n
+
+
+def replay_stats():
+    with _stats_lock:
+        return dict(STATS)
+
+
+def format_stats(stats):
+    if not stats:
+        return []
+    return [
+        f"📼 archive ({mode()}): {int(stats.get('recorded', 0))} responses recorded, "
+        f"{int(stats.get('replayed', 0))} replayed, {int(stats.get('missing', 0))} missing"
+    ]
+
+
+# ======================================================
+# HELPERS
+# ======================================================
+def request_key(method, url, body=None):
+    """Archive key of a request: method, URL with sorted query, hash of the body."""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    canonical = urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", query, ""))
+
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    body_sha = hashlib.sha256(body).hexdigest() if body else ""
+
+    return hashlib.sha256(f"{method.upper()} {canonical} {body_sha}".encode("utf-8")).hexdigest()
+
+
+def clean_headers(headers):
+    return {k: v for k, v in dict(headers or {}).items() if k.lower() not in DROP_HEADERS}
+
+
+# ======================================================
+# ARCHIVE
+# ======================================================
+class Archive:
+    """
+    Content-addressed store of HTTP responses.
+
+    Bodies live in ``<dir>/blobs/<aa>/<sha256>`` so a page served many times
+    is stored once; an SQLite index maps each request key to the status,
+    headers and body hash of the last response recorded for it.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.join(path, "blobs"), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(path, "index.db"), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(SCHEMA)
+        self._conn.commit()
+
+    def _blob(self, sha):
+        return os.path.join(self.path, "blobs", sha[:2], sha)
+
+    def put(self, method, url, status, headers, body, request_body=None):
+        body = body or b""
+        sha = hashlib.sha256(body).hexdigest()
+        blob = self._blob(sha)
+
+        if not os.path.exists(blob):
+            os.makedirs(os.path.dirname(blob), exist_ok=True)
+            tmp = f"{blob}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(body)
+            os.replace(tmp, blob)
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (request_key(method, url, request_body), method.upper(), url, int(status),
+                 json.dumps(clean_headers(headers)), sha, len(body), time.time())
+            )
+            self._conn.commit()
+        _count("recorded")
+
+    def get(self, method, url, request_body=None):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, headers, body_sha FROM responses WHERE key = ?",
+                (request_key(method, url, request_body),)
+            ).fetchone()
+
+        if row is None:
+            _count("missing")
+            return None
+
+        try:
+            with open(self._blob(row[2]), "rb") as f:
+                body = f.read()
+        except OSError:
+            _count("missing")
+            return None
+
+        _count("replayed")
+        return Recorded(row[0], json.loads(row[1]), body)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_archives = {}
+_archives_lock = threading.Lock()
+
+
+def archive():
+    """The archive of this process; forked workers open their own connection."""
+    key = (os.getpid(), archive_dir())
+    with _archives_lock:
+        if key not in _archives:
+            _archives[key] = Archive(archive_dir())
+        return _archives[key]
+
+
+# ======================================================
+# REQUESTS
+# ======================================================
+class ArchiveAdapter(HTTPAdapter):
+    """HTTPAdapter that records or replays responses according to the network mode."""
+
+    def send(self, request, **kwargs):
+        if replaying():
+            hit = archive().get(request.method, request.url, request.body)
+            if hit is None:
+                raise requests.ConnectionError(f"not in replay archive: {request.method} {request.url}",
+                                               request=request)
+            return self._replayed(request, hit)
+
+        response = super().send(request, **kwargs)
+        if recording():
+            archive().put(request.method, request.url, response.status_code, response.headers,
+                          response.content, request.body)
+        return response
+
+    @staticmethod
+    def _replayed(request, hit):
+        response = requests.Response()
+        response.status_code = hit.status
+        response.headers = CaseInsensitiveDict(hit.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.reason = "Replayed"
+        response._content = hit.body
+        return response
+
+
+# ======================================================
+# PLAYWRIGHT
+# ======================================================
+async def serve_route_async(route):
+    """Answer a Playwright route from the archive, or fetch it and record it."""
+    request = route.request
+    if replaying():
+        hit = archive().get(request.method, request.url, request.post_data_buffer)
+        if hit is None:
+            await route.abort("internetdisconnected")
+        else:
+            await route.fulfill(status=hit.status, headers=hit.headers, body=hit.body)
+        return
+
+    response = await route.fetch()
+    archive().put(request.method, request.url, response.status, response.headers,
+                  await response.body(), request.post_data_buffer)
+    await route.fulfill(response=response)
+
+
+# ======================================================
+# SELENIUM PROXY
+# ======================================================
+def proxy_certificate(path):
+    """Self-signed certificate the proxy presents for every HTTPS host (Chrome ignores the mismatch)."""
+    pem = os.path.join(path, "proxy.pem")
+    if os.path.exists(pem):
+        return pem
+
+    if shutil.which("openssl") is None:
+        return None
+
+    os.makedirs(path, exist_ok=True)
+    key, cert = f"{pem}.key", f"{pem}.crt"
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "3650",
+         "-subj", "/CN=scraper-archive-proxy", "-keyout", key, "-out", cert],
+        check=True, capture_output=True
+    )
+    with open(pem, "w", encoding="utf-8") as out:
+        for part in (key, cert):
+            with open(part, encoding="utf-8") as f:
+                out.write(f.read())
+            os.remove(part)
+    return pem
+
+
+def make_proxy_handler(tls_context):
+    upstream = requests.Session()
+
+    class ArchiveProxyHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        origin = None
+
+        def log_message(self, *args):
+            pass
+
+        def do_CONNECT(self):
+            if tls_context is None:
+                self.send_error(502, "HTTPS interception unavailable (no openssl)")
+                return
+
+            self.send_response(200, "Connection Established")
+            self.end_headers()
+
+            host = self.path if not self.path.endswith(":443") else self.path[:-4]
+            try:
+                self.connection = tls_context.wrap_socket(self.connection, server_side=True)
+            except ssl.SSLError:
+                self.close_connection = True
+                return
+
+            # the rest of this connection is plain HTTP requests inside TLS
+            self.origin = f"https://{host}"
+            self.rfile = self.connection.makefile("rb", self.rbufsize)
+            self.wfile = self.connection.makefile("wb", self.wbufsize)
+            self.close_connection = False
+
+        def _url(self):
+            return self.origin + self.path if self.origin else self.path
+
+        def _proxy(self):
+            url = self._url()
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else None
+
+            if replaying():
+                hit = archive().get(self.command, url, body)
+                if hit is None:
+                    return self._send(504, {"Content-Type": "text/plain"}, b"not in replay archive")
+                return self._send(hit.status, hit.headers, hit.body)
+
+            headers = {k: v for k, v in self.headers.items()
+                       if k.lower() not in DROP_HEADERS and k.lower() != "host"}
+            try:
+                response = upstream.request(self.command, url, headers=headers, data=body,
+                                            allow_redirects=False, timeout=UPSTREAM_TIMEOUT)
+            except requests.RequestException as e:
+                return self._send(502, {"Content-Type": "text/plain"}, str(e).encode("utf-8"))
+
+            if recording():
+                archive().put(self.command, url, response.status_code, response.headers,
+                              response.content, body)
+            return self._send(response.status_code, response.headers, response.content)
+
+        def _send(self, status, headers, body):
+            self.send_response(status)
+            for k, v in clean_headers(headers).items():
+                self.send_header(k, v)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if self.command != "HEAD":
+                self.wfile.write(body)
+            self.wfile.flush()
+
+        do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = do_OPTIONS = _proxy
+
+    return ArchiveProxyHandler
+
+
+_proxies = {}
+
+
+def proxy_address():
+    """``host:port`` of this process's recording/replaying proxy, started on first use."""
+    if os.getpid() in _proxies:
+        return _proxies[os.getpid()]
+
+    tls_context = None
+    pem = proxy_certificate(archive_dir())
+    if pem is not None:
+        tls_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        tls_context.load_cert_chain(pem)
+    else:
+        print("⚠ openssl not found: HTTPS pages cannot be recorded or replayed through the proxy")
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_proxy_handler(tls_context))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    _proxies[os.getpid()] = f"127.0.0.1:{server.server_address[1]}"
+    return _proxies[os.getpid()]
+
+
+def chrome_args():
+    """Chrome flags that send every request of a Selenium session through the proxy."""
+    if not active():
+        return []
+    return [
+        f"--proxy-server=http://{proxy_address()}",
+        "--proxy-bypass-list=<-loopback>",
+        "--ignore-certificate-errors",
+    ]
@@ -0,0 +1,185 @@
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from scrapers import replay
+
+# ======================================================
+# CONFIG
+# ======================================================
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DB_PATH = os.getenv("POSTINGS_DB", os.path.join(PROJECT_ROOT, "output", "postings.db"))
+
+# Set SCRAPER_INCREMENTAL=0 to re-fetch every detail page
+INCREMENTAL = os.getenv("SCRAPER_INCREMENTAL", "1") != "0"
+
+# Stored details older than this are fetched again
+REFRESH_DAYS = float(os.getenv("POSTINGS_REFRESH_DAYS", "7"))
+
+TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "mc_cid", "mc_eid")
+
+FIELDS = ("Title", "Description", "Deadline", "Matched_Vertical")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS postings (
+    link         TEXT PRIMARY KEY,
+    source       TEXT NOT NULL,
+    title        TEXT,
+    description  TEXT,
+    deadline     TEXT,
+    vertical     TEXT,
+    content_hash TEXT,
+    first_seen   REAL NOT NULL,
+    last_seen    REAL NOT NULL,
+    fetched_at   REAL NOT NULL
+)
+"""
+
+
+# ======================================================
+# HELPERS
+# ======================================================
+def canonical_link(url):
+    """Normalise a posting URL so the same page always maps to one key."""
+    if not isinstance(url, str) or not url.strip():
+        return ""
+
+    parts = urlsplit(url.strip())
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith(TRACKING_PARAMS)
+    )
+    path = parts.path.rstrip("/") or "/"
+
+    return urlunsplit((
+        parts.scheme.lower(),
+        parts.netloc.lower(),
+        path,
+        urlencode(query),
+        ""
+    ))
+
+
+def content_hash(record):
+    payload = "\x1f".join(str(record.get(f) or "") for f in FIELDS)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# ======================================================
+# STORE
+# ======================================================
+class PostingStore:
+    """
+    SQLite store of postings keyed by canonical Apply_Link.
+
+    Scrapers call ``lookup`` before scheduling a detail fetch and ``save``
+    after one. ``lookup`` only returns postings whose details were fetched
+    within REFRESH_DAYS, so edits on the site are picked up eventually.
+    Recording and replaying runs fetch every detail page.
+    """
+
+    def __init__(self, source, path=DB_PATH, enabled=None):
+        if enabled is None:
+            enabled = INCREMENTAL and not replay.active()
+
+        self.source = source
+        self.path = path
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = None
+
+        if enabled:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(SCHEMA)
+            self._conn.commit()
+
+    def lookup(self, link):
+        """Return stored fields for ``link`` (and mark it seen) or None."""
+        if not self.enabled:
+            return None
+
+        key = canonical_link(link)
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT title, description, deadline, vertical, fetched_at "
+                "FROM postings WHERE link = ?",
+                (key,)
+            ).fetchone()
+
+            if row is None or now - row[4] > REFRESH_DAYS * 86400:
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE postings SET last_seen = ? WHERE link = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+
+        return dict(zip(FIELDS, row[:4]))
+
+    def save(self, link, **fields):
+        """Insert or refresh a posting after its details were fetched."""
+        if not self.enabled:
+            return
+
+        key = canonical_link(link)
+        if not key:
+            return
+
+        record = {f: fields.get(f) for f in FIELDS}
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO postings (link, source, title, description, deadline, vertical,
+                                      content_hash, first_seen, last_seen, fetched_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(link) DO UPDATE SET
+                    source = excluded.source,
+                    title = excluded.title,
+                    description = excluded.description,
+                    deadline = excluded.deadline,
+                    vertical = excluded.vertical,
+                    content_hash = excluded.content_hash,
+                    last_seen = excluded.last_seen,
+                    fetched_at = excluded.fetched_at
+                """,
+                (
+                    key, self.source, record["Title"], record["Description"],
+                    record["Deadline"], record["Matched_Vertical"], content_hash(record),
+                    now, now, now
+                )
+            )
+            self._conn.commit()
+
+    def report(self):
+        if not self.enabled:
+            return
+
+        total = self.hits + self.misses
+        rate = self.hits / total * 100 if total else 0.0
+        print(
+            f"💾 {self.source} store: {self.hits}/{total} hits ({rate:.0f}%), "
+            f"{self.hits} detail fetches avoided"
+        )
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
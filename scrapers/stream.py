@@ -0,0 +1,207 @@
+import os
+import json
+import time
+import queue
+import threading
+from collections import Counter, defaultdict
+
+import pandas as pd
+
+from scrapers.classifier import classify_column
+from scrapers.deadlines import DATE_COLUMN, DROP_EXPIRED, parse_deadlines, today
+from scrapers.normalize import FINAL_COLUMNS
+from scrapers.store import canonical_link
+
+# ======================================================
+# CONFIG
+# ======================================================
+# A worker hands rows on after this many records or seconds, whichever first
+BATCH_ROWS = int(os.getenv("STREAM_BATCH_ROWS", "25"))
+BATCH_SECONDS = float(os.getenv("STREAM_BATCH_SECONDS", "1.0"))
+
+
+# ======================================================
+# BATCHING
+# ======================================================
+_DONE = object()
+
+
+def batched(records, size=BATCH_ROWS, interval=BATCH_SECONDS):
+    """
+    Group a record generator into lists of up to ``size`` records.
+
+    The generator runs on a helper thread, so a batch is handed on after
+    ``interval`` seconds even while the scraper is blocked on a slow page,
+    and records produced before an exception are yielded before it is
+    re-raised. When the consumer stops early (it raised, or closed this
+    generator) the helper thread stops at the next record and closes the
+    scraper's generator, so its browsers are shut down too.
+    """
+    items = queue.Queue()
+    stop = threading.Event()
+
+    def produce():
+        try:
+            for record in records:
+                if stop.is_set():
+                    break
+                items.put(record)
+            else:
+                items.put(_DONE)
+        except BaseException as e:
+            items.put(e)
+        finally:
+            # the scraper's own cleanup runs on the thread that drove it
+            close = getattr(records, "close", None)
+            if close is not None:
+                close()
+
+    threading.Thread(target=produce, name="record-producer", daemon=True).start()
+
+    batch = []
+    flush_at = time.monotonic() + interval
+    try:
+        while True:
+            try:
+                item = items.get(timeout=max(0.0, flush_at - time.monotonic()))
+            except queue.Empty:
+                item = None
+
+            if item is _DONE or isinstance(item, BaseException):
+                if batch:
+                    yield batch
+                if item is _DONE:
+                    return
+                raise item
+
+            if item is not None:
+                batch.append(item)
+
+            if batch and (len(batch) >= size or time.monotonic() >= flush_at):
+                yield batch
+                batch = []
+
+            if time.monotonic() >= flush_at:
+                flush_at = time.monotonic() + interval
+    finally:
+        stop.set()
+
+
+# ======================================================
+# SINK
+# ======================================================
+class JsonlSink:
+    """
+    Append-only JSONL file of normalized postings.
+
+    Every batch is flushed as soon as it is written, so a run that is killed
+    still leaves every row it had accepted on disk. A torn last line is
+    skipped when the file is read back.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "w", encoding="utf-8")
+
+    def write(self, records):
+        for record in records:
+            self._file.write(json.dumps(record, ensure_ascii=False, default=str))
+            self._file.write("\n")
+        self._file.flush()
+
+    def read(self):
+        rows = []
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rows.append(json.loads(line))
+                except ValueError:
+                    continue
+        return pd.DataFrame(rows, columns=FINAL_COLUMNS)
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ======================================================
+# RECORD STREAM
+# ======================================================
+def dedup_key(record):
+    link = record.get("Apply_Link")
+    if link:
+        return canonical_link(link)
+    return f"{record.get('Source')}|{record.get('Title')}"
+
+
+class RecordStream:
+    """
+    Consumer side of the streaming pipeline.
+
+    ``add`` takes a batch of raw records from one scraper, normalizes them,
+    drops postings whose deadline has passed (DROP_EXPIRED), classifies
+    rows that arrive without a vertical, drops postings the same
+    source already sent in this run and appends the rest to the sink.
+    Duplicates across sources are merged later, by ``dedup.dedupe``.
+    """
+
+    def __init__(self, sink):
+        self.sink = sink
+        self.seen = set()
+        self.counts = defaultdict(Counter)
+
+    def add(self, scraper, records):
+        if not records:
+            return 0
+
+        df = scraper.normalize(pd.DataFrame(records))
+
+        if DROP_EXPIRED:
+            expired = parse_deadlines(df["Deadline"], scraper.name)[DATE_COLUMN] < today()
+            if expired.any():
+                self.counts[scraper.name]["expired"] += int(expired.sum())
+                df = df[~expired].reset_index(drop=True)
+                if df.empty:
+                    return 0
+
+        # Sources without their own matching (ESTM) are classified here
+        missing = df["Matched_Vertical"].fillna("").astype(str).str.strip() == ""
+        if missing.any():
+            text = (
+                df.loc[missing, "Title"].fillna("").astype(str)
+                + " "
+                + df.loc[missing, "Description"].fillna("").astype(str)
+            )
+            df["Matched_Vertical"] = df["Matched_Vertical"].astype(object)
+            df.loc[missing, "Matched_Vertical"] = classify_column(text, source=scraper.name)["Matched_Vertical"].values
+
+        rows = []
+        for record in df.astype(object).where(df.notna(), None).to_dict("records"):
+            key = (scraper.name, dedup_key(record))
+            if key in self.seen:
+                self.counts[scraper.name]["duplicates"] += 1
+                continue
+            self.seen.add(key)
+            rows.append(record)
+
+        self.sink.write(rows)
+        self.counts[scraper.name]["rows"] += len(rows)
+        return len(rows)
+
+    def rows(self, source):
+        return self.counts[source]["rows"]
+
+    def frame(self, order=None):
+        """Everything written so far, grouped by ``order`` (source names)."""
+        df = self.sink.read()
+        if order:
+            rank = {name: i for i, name in enumerate(order)}
+            df = df.sort_values("Source", key=lambda s: s.map(rank).fillna(len(rank)), kind="stable")
+        return df.reset_index(drop=True)
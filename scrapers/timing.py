@@ -0,0 +1,112 @@
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+from collections import defaultdict
+
+# ======================================================
+# SPAN LOG
+# ======================================================
+RUNNER = "runner"
+
+# source → stage → {"seconds": [durations], "errors": n}
+SPANS = defaultdict(lambda: defaultdict(lambda: {"seconds": [], "errors": 0}))
+_log_lock = threading.Lock()
+
+# Source that spans are charged to when none is given. Process-wide on
+# purpose: scraper generators run on helper threads of the same process.
+_current = {"source": RUNNER}
+
+
+def set_source(source):
+    _current["source"] = source or RUNNER
+
+
+def record_span(stage, seconds, source=None, error=False):
+    with _log_lock:
+        entry = SPANS[source or _current["source"]][stage]
+        entry["seconds"].append(seconds)
+        if error:
+            entry["errors"] += 1
+
+
+@contextmanager
+def span(stage, source=None):
+    """Time the ``with`` body as one occurrence of ``stage``; exceptions count as errors."""
+    start = time.perf_counter()
+    error = False
+    try:
+        yield
+    except BaseException:
+        error = True
+        raise
+    finally:
+        record_span(stage, time.perf_counter() - start, source, error)
+
+
+def span_stats():
+    with _log_lock:
+        return {
+            source: {
+                stage: {"seconds": list(v["seconds"]), "errors": v["errors"]}
+                for stage, v in stages.items()
+            }
+            for source, stages in SPANS.items()
+        }
+
+
+def reset():
+    with _log_lock:
+        SPANS.clear()
+
+
+# ======================================================
+# SUMMARY
+# ======================================================
+def percentile(values, q):
+    """Nearest-rank percentile of an unsorted list (q in 0..100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+def summarize(stats):
+    """Per-source, per-stage count / total / p50 / p95 / max / errors."""
+    summary = {}
+    for source, stages in sorted(stats.items()):
+        summary[source] = {}
+        for stage, v in sorted(stages.items()):
+            seconds = v.get("seconds", [])
+            summary[source][stage] = {
+                "count": len(seconds),
+                "total": round(sum(seconds), 3),
+                "p50": round(percentile(seconds, 50), 4),
+                "p95": round(percentile(seconds, 95), 4),
+                "max": round(max(seconds), 4) if seconds else 0.0,
+                "errors": v.get("errors", 0),
+            }
+    return summary
+
+
+def format_stats(summary, top=5):
+    """The slowest stages of each source, as ⏱ lines."""
+    lines = []
+    for source, stages in summary.items():
+        slowest = sorted(stages.items(), key=lambda kv: kv[1]["total"], reverse=True)[:top]
+        parts = ", ".join(
+            f"{stage} {v['total']:.1f}s/{v['count']} (p95 {v['p95'] * 1000:.0f} ms)" for stage, v in slowest
+        )
+        lines.append(f"⏱ {source}: {parts}")
+    return lines
+
+
+def write_report(path, report):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, default=str)
+        f.write("\n")
+    os.replace(tmp, path)
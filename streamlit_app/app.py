@@ -1,5 +1,6 @@
 import streamlit as st
 import os
+import json
 import base64
 
 # ------------------------------------------------------
@@ -221,6 +222,23 @@ with col2:
 
     COMBINED_FILE = "Combined.xlsx"
     COMBINED_PATH = os.path.join(OUTPUT_DIR, COMBINED_FILE)
+    MANIFEST_PATH = os.path.join(OUTPUT_DIR, "manifest.json")
+
+    # ------------------------------------------------------
+    # Dataset Summary (from the runner's manifest)
+    # ------------------------------------------------------
+    if os.path.exists(MANIFEST_PATH):
+        try:
+            with open(MANIFEST_PATH, encoding="utf-8") as f:
+                manifest = json.load(f)
+            per_source = ", ".join(f"{src}: {n}" for src, n in manifest.get("rows_by_source", {}).items())
+            st.markdown(
+                f'<p style="text-align: center;">{manifest.get("rows", 0)} listings ({per_source}) '
+                f'&middot; updated {manifest.get("generated_at", "")}</p>',
+                unsafe_allow_html=True
+            )
+        except (OSError, ValueError):
+            pass
 
     # ------------------------------------------------------
     # Download Section